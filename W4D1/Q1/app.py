@@ -1,42 +1,54 @@
-from flask import Flask, request, jsonify, render_template
+from flask import Flask, request, jsonify, render_template, Response, stream_with_context
 from flask_cors import CORS
 import json
+import os
+import time
+from knowledge_index import KnowledgeIndex, tokenize
+from response_cache import TTLCache, LatencyStats
 
 app = Flask(__name__)
 CORS(app)
 
-# MCP Knowledge Base
-mcp_knowledge = {
-    "general": {
-        "what is mcp": "Model Context Protocol (MCP) is a standardized protocol for communication between AI models and development environments. It enables seamless integration of AI capabilities into applications while maintaining context and state.",
-        "benefits of mcp": "MCP offers several benefits: 1) Standardized communication between AI and applications, 2) Maintains context across interactions, 3) Enables stateful conversations, 4) Supports multiple model providers, 5) Improves development workflow.",
-        "when to use mcp": "Use MCP when you need: 1) AI-powered features in your application, 2) Consistent model interactions, 3) Context preservation across calls, 4) Integration with multiple AI providers."
-    },
-    "implementation": {
-        "how to implement mcp": "To implement MCP: 1) Set up an MCP server, 2) Configure model providers, 3) Define context handlers, 4) Implement API endpoints, 5) Handle state management.",
-        "mcp server setup": "Basic MCP server setup involves: 1) Installing dependencies, 2) Configuring server settings, 3) Setting up authentication, 4) Implementing required endpoints.",
-        "best practices": "MCP best practices: 1) Use secure connections, 2) Implement proper error handling, 3) Manage context efficiently, 4) Monitor performance, 5) Regular maintenance."
-    },
-    "troubleshooting": {
-        "common issues": "Common MCP issues: 1) Connection problems, 2) Authentication errors, 3) Context loss, 4) Performance bottlenecks, 5) Integration conflicts.",
-        "debugging tips": "Debug MCP by: 1) Checking logs, 2) Verifying configurations, 3) Testing connections, 4) Monitoring resource usage, 5) Validating context flow."
-    }
-}
+# MCP Knowledge Base, loaded from an external file so it can grow without code changes
+KNOWLEDGE_FILE = os.getenv(
+    'MCP_KNOWLEDGE_FILE',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'knowledge.json')
+)
+
+with open(KNOWLEDGE_FILE, 'r') as f:
+    mcp_knowledge = json.load(f)
+
+# Built once at startup so each request only touches the postings of its query terms
+knowledge_index = KnowledgeIndex(mcp_knowledge)
 
 def find_best_match(query):
-    query = query.lower()
-    best_score = 0
-    best_answer = "I'm sorry, I don't have specific information about that. Could you try rephrasing your question?"
-    
-    for category in mcp_knowledge:
-        for q, a in mcp_knowledge[category].items():
-            # Simple word matching score
-            score = sum(word in query for word in q.split())
-            if score > best_score:
-                best_score = score
-                best_answer = a
-    
-    return best_answer
+    matches = knowledge_index.search(query, top_k=1)
+    if not matches:
+        return "I'm sorry, I don't have specific information about that. Could you try rephrasing your question?"
+    _, _, _, answer = matches[0]
+    return answer
+
+# Answers for recently asked questions, keyed by the normalized query
+response_cache = TTLCache(
+    maxsize=int(os.getenv('CHAT_CACHE_SIZE', '1024')),
+    ttl=float(os.getenv('CHAT_CACHE_TTL', '300'))
+)
+chat_latency = LatencyStats()
+
+# Words sent per server-sent event when streaming an answer
+STREAM_CHUNK_WORDS = 4
+
+def normalize_query(query):
+    # The index scores a bag of stemmed terms, so queries with the same terms share an answer
+    return ' '.join(sorted(set(tokenize(query))))
+
+def get_answer(query):
+    key = normalize_query(query)
+    answer = response_cache.get(key)
+    if answer is None:
+        answer = find_best_match(query)
+        response_cache.set(key, answer)
+    return answer
 
 @app.route('/')
 def home():
@@ -44,14 +56,50 @@ def home():
 
 @app.route('/api/chat', methods=['POST'])
 def chat():
+    started = time.perf_counter()
     data = request.json
     user_message = data.get('message', '').lower()
     
-    response = find_best_match(user_message)
+    response = get_answer(user_message)
+    chat_latency.record(time.perf_counter() - started)
     
     return jsonify({
         'response': response
     })
 
+@app.route('/api/chat/stream', methods=['GET', 'POST'])
+def chat_stream():
+    """Stream the answer as server-sent events so the widget can render it immediately"""
+    started = time.perf_counter()
+    if request.method == 'POST':
+        user_message = (request.json or {}).get('message', '')
+    else:
+        user_message = request.args.get('message', '')
+
+    response = get_answer(user_message.lower())
+    chat_latency.record(time.perf_counter() - started)
+
+    def generate():
+        words = response.split(' ')
+        for i in range(0, len(words), STREAM_CHUNK_WORDS):
+            chunk = ' '.join(words[i:i + STREAM_CHUNK_WORDS])
+            if i + STREAM_CHUNK_WORDS < len(words):
+                chunk += ' '
+            yield f"data: {json.dumps({'token': chunk})}\n\n"
+        yield "event: done\ndata: {}\n\n"
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+@app.route('/api/metrics')
+def metrics():
+    return jsonify({
+        'cache': response_cache.stats(),
+        'latency': chat_latency.stats()
+    })
+
 if __name__ == '__main__':
     app.run(debug=True, port=5000) 
\ No newline at end of file
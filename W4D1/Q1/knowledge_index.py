@@ -0,0 +1,98 @@
+import math
+import re
+from collections import Counter, defaultdict
+
+# BM25 parameters
+K1 = 1.5
+B = 0.75
+
+# Question words count this many times more than answer words
+QUESTION_BOOST = 3
+
+# Question words like 'what'/'how' are kept: they separate 'what is mcp' from 'how to implement mcp'
+STOP_WORDS = frozenset({
+    'a', 'an', 'the', 'to', 'of', 'and', 'or', 'in', 'on', 'for', 'with',
+    'i', 'my', 'me', 'you', 'it', 'this', 'that', 'some', 'any', 'please'
+})
+
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+
+def stem(word):
+    """Light suffix-stripping stemmer so 'benefits'/'benefit' and 'debugging'/'debug' match"""
+    if len(word) <= 3:
+        return word
+    if word.endswith('ies') and len(word) > 4:
+        return word[:-3] + 'y'
+    if word.endswith('sses'):
+        return word[:-2]
+    if word.endswith('s') and not word.endswith(('ss', 'us', 'is')):
+        word = word[:-1]
+    for suffix in ('ing', 'ed'):
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            word = word[:-len(suffix)]
+            # debugging -> debugg -> debug
+            if len(word) > 3 and word[-1] == word[-2] and word[-1] not in 'lsz':
+                word = word[:-1]
+            break
+    for suffix in ('ation', 'ment', 'ly'):
+        if word.endswith(suffix) and len(word) - len(suffix) >= 4:
+            return word[:-len(suffix)]
+    return word
+
+def tokenize(text):
+    """Lowercase, split into words, drop stop words and stem"""
+    return [stem(w) for w in TOKEN_PATTERN.findall(text.lower()) if w not in STOP_WORDS]
+
+class KnowledgeIndex:
+    """BM25 inverted index over knowledge base questions and answers"""
+
+    def __init__(self, knowledge):
+        # entries: (category, question, answer)
+        self.entries = [
+            (category, question, answer)
+            for category, qa in knowledge.items()
+            for question, answer in qa.items()
+        ]
+        self.postings = defaultdict(list)  # term -> [(entry_idx, weighted tf)]
+        self.question_terms = []
+        doc_lengths = []
+
+        for idx, (_, question, answer) in enumerate(self.entries):
+            q_tokens = tokenize(question)
+            counts = Counter(tokenize(answer))
+            for token in q_tokens:
+                counts[token] += QUESTION_BOOST
+            for term, tf in counts.items():
+                self.postings[term].append((idx, tf))
+            self.question_terms.append(frozenset(q_tokens))
+            doc_lengths.append(sum(counts.values()))
+
+        n_docs = len(self.entries)
+        avg_length = sum(doc_lengths) / n_docs if n_docs else 0
+        # Per-document length normalisation is fixed once the index is built
+        self.length_norm = [
+            K1 * (1 - B + B * length / avg_length) if avg_length else K1
+            for length in doc_lengths
+        ]
+        self.idf = {
+            term: math.log(1 + (n_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+            for term, postings in self.postings.items()
+        }
+
+    def search(self, query, top_k=1):
+        """Return up to top_k (score, category, question, answer) tuples, best first"""
+        terms = set(tokenize(query))
+        scores = defaultdict(float)
+        for term in terms:
+            idf = self.idf.get(term)
+            if idf is None:
+                continue
+            for idx, tf in self.postings[term]:
+                scores[idx] += idf * tf * (K1 + 1) / (tf + self.length_norm[idx])
+
+        # Break score ties by how many query terms hit the question, then KB order
+        ranked = sorted(
+            scores.items(),
+            key=lambda item: (-item[1], -len(terms & self.question_terms[item[0]]), item[0])
+        )
+        return [(score,) + self.entries[idx] for idx, score in ranked[:top_k]]
\ No newline at end of file
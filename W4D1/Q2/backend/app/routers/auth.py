@@ -4,8 +4,8 @@ from datetime import timedelta
 import uuid
 from ..models.user import UserCreate, User, Token
 from ..utils.auth import (
-    get_password_hash,
-    verify_password,
+    get_password_hash_async,
+    verify_password_async,
     create_access_token,
     ACCESS_TOKEN_EXPIRE_MINUTES,
     get_users,
@@ -33,7 +33,7 @@ async def register(user: UserCreate):
         "id": user_id,
         "email": user.email,
         "username": user.username,
-        "hashed_password": get_password_hash(user.password),
+        "hashed_password": await get_password_hash_async(user.password),
         "interactions": {
             "viewed": [],
             "liked": [],
@@ -56,7 +56,7 @@ async def login(form_data: OAuth2PasswordRequestForm = Depends()):
         None
     )
     
-    if not user or not verify_password(form_data.password, user["hashed_password"]):
+    if not user or not await verify_password_async(form_data.password, user["hashed_password"]):
         raise HTTPException(
             status_code=401,
             detail="Incorrect email or password",
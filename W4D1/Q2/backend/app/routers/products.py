@@ -4,6 +4,7 @@ from ..models.user import User
 from .auth import get_current_user
 from ..main import PRODUCTS
 from ..utils.auth import get_users, save_users
+from .recommendations import recommendation_engine, profile_store
 
 router = APIRouter()
 
@@ -57,13 +58,18 @@ async def track_interaction(
         )
     
     # Verify product exists
-    if not any(p["id"] == product_id for p in PRODUCTS["products"]):
+    if product_id not in recommendation_engine.product_index:
         raise HTTPException(
             status_code=404,
             detail="Product not found"
         )
     
-    # Update user interactions
+    # Append to the interaction log and update the profile vector incrementally
+    profile_store.ensure_profile(current_user.id, current_user.interactions)
+    if not profile_store.record(current_user.id, product_id, interaction_type):
+        return {"status": "success"}
+
+    # Keep the user's interaction lists in sync for clients that read them
     users_data = get_users()
     user_data = users_data["users"][current_user.id]
     
@@ -1,15 +1,22 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request, Response
 from typing import List, Dict
 from ..utils.recommendations import RecommendationEngine
+from ..utils.interactions import InteractionLog, UserProfileStore
 from ..models.user import User
 from .auth import get_current_user
 from ..main import PRODUCTS
 
 router = APIRouter()
 
+# Browsers and CDNs may reuse /popular responses for this long before revalidating
+POPULAR_CACHE_MAX_AGE = 60
+
 # Initialize recommendation engine
 recommendation_engine = RecommendationEngine(PRODUCTS["products"])
 
+# Per-user profile vectors, rebuilt from the interaction log at startup
+profile_store = UserProfileStore(recommendation_engine, InteractionLog())
+
 @router.get("/similar/{product_id}", response_model=List[Dict])
 async def get_similar_products(product_id: str, n: int = 5):
     """Get similar products based on product features"""
@@ -21,16 +28,27 @@ async def get_personalized_recommendations(
     current_user: User = Depends(get_current_user)
 ):
     """Get personalized recommendations based on user interactions"""
-    return recommendation_engine.get_personalized_recommendations(
+    return profile_store.recommend(
+        current_user.id,
         current_user.interactions,
         n
     )
 
 @router.get("/popular", response_model=List[Dict])
-async def get_popular_products(n: int = 5):
+async def get_popular_products(request: Request, response: Response, n: int = 5):
     """Get most popular products based on ratings and review count"""
-    return sorted(
-        PRODUCTS["products"],
-        key=lambda x: (x["rating"] * x["reviews_count"]),
-        reverse=True
-    )[:n] 
\ No newline at end of file
+    etag = f'"{recommendation_engine.popularity.etag}-{n}"'
+    cache_headers = {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={POPULAR_CACHE_MAX_AGE}"
+    }
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and (
+        if_none_match.strip() == "*" or
+        etag in (tag.strip() for tag in if_none_match.split(","))
+    ):
+        return Response(status_code=304, headers=cache_headers)
+
+    response.headers.update(cache_headers)
+    return recommendation_engine.popularity.top(n) 
\ No newline at end of file
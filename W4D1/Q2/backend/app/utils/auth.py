@@ -1,9 +1,14 @@
 from passlib.context import CryptContext
 from jose import JWTError, jwt
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Dict, Tuple
+from concurrent.futures import ThreadPoolExecutor
 from ..models.user import TokenData
+import asyncio
 import json
+import os
+import threading
+import time
 from pathlib import Path
 
 # Security constants
@@ -12,7 +17,19 @@ ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
 # Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))  # Work factor, each +1 doubles the cost
+HASH_WORKERS = int(os.getenv("HASH_WORKERS", "4"))  # Max concurrent hash operations
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=BCRYPT_ROUNDS)
+
+# bcrypt releases the GIL, so a small thread pool keeps hashing off the event loop
+# while bounding how many CPU-heavy hashes run at once during login bursts.
+_hash_executor = ThreadPoolExecutor(max_workers=HASH_WORKERS, thread_name_prefix="pwd-hash")
+
+# Decoded token claims, keyed by token and dropped once the token expires
+TOKEN_CACHE_MAX_SIZE = int(os.getenv("TOKEN_CACHE_MAX_SIZE", "10000"))
+_token_cache: Dict[str, Tuple[TokenData, float]] = {}
+_token_cache_lock = threading.Lock()
 
 # User storage (using file storage for MVP)
 USERS_FILE = Path(__file__).parent.parent.parent.parent / "data" / "users.json"
@@ -34,6 +51,16 @@ def verify_password(plain_password, hashed_password):
 def get_password_hash(password):
     return pwd_context.hash(password)
 
+async def verify_password_async(plain_password, hashed_password):
+    """Verify a password in the hashing pool without blocking the event loop"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_hash_executor, verify_password, plain_password, hashed_password)
+
+async def get_password_hash_async(password):
+    """Hash a password in the hashing pool without blocking the event loop"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_hash_executor, get_password_hash, password)
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
     if expires_delta:
@@ -44,13 +71,41 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
+def _get_cached_token(token: str) -> Optional[TokenData]:
+    with _token_cache_lock:
+        entry = _token_cache.get(token)
+        if entry is None:
+            return None
+        token_data, expires_at = entry
+        if expires_at <= time.time():
+            del _token_cache[token]
+            return None
+        return token_data
+
+def _cache_token(token: str, token_data: TokenData, expires_at: float):
+    with _token_cache_lock:
+        if len(_token_cache) >= TOKEN_CACHE_MAX_SIZE:
+            # Drop expired tokens first, then the oldest entries if still full
+            now = time.time()
+            for key in [k for k, (_, exp) in _token_cache.items() if exp <= now]:
+                del _token_cache[key]
+            while len(_token_cache) >= TOKEN_CACHE_MAX_SIZE:
+                del _token_cache[next(iter(_token_cache))]
+        _token_cache[token] = (token_data, expires_at)
+
 def verify_token(token: str):
+    cached = _get_cached_token(token)
+    if cached is not None:
+        return cached
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         email: str = payload.get("sub")
         if email is None:
             return None
         token_data = TokenData(email=email)
+        expires_at = payload.get("exp")
+        if expires_at is not None:
+            _cache_token(token, token_data, float(expires_at))
         return token_data
     except JWTError:
-        return None 
\ No newline at end of file
+        return None
\ No newline at end of file
@@ -0,0 +1,102 @@
+import json
+import numpy as np
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Set, Tuple
+from .recommendations import RecommendationEngine, INTERACTION_WEIGHTS
+
+# Append-only interaction log (one JSON event per line), stored next to users.json
+INTERACTIONS_LOG = Path(__file__).parent.parent.parent.parent / "data" / "interactions.log"
+
+class InteractionLog:
+    """Append-only log of user interactions, replayed on startup to rebuild profiles"""
+
+    def __init__(self, path: Path = INTERACTIONS_LOG):
+        self.path = Path(path)
+
+    def append(self, user_id: str, product_id: str, interaction_type: str) -> Dict:
+        """Append one interaction event and flush it to disk"""
+        event = {
+            "timestamp": datetime.utcnow().isoformat(),
+            "user_id": user_id,
+            "product_id": product_id,
+            "type": interaction_type
+        }
+        with open(self.path, "a") as f:
+            f.write(json.dumps(event) + "\n")
+        return event
+
+    def replay(self) -> Iterator[Dict]:
+        """Yield every logged event in order, skipping a torn trailing line"""
+        if not self.path.exists():
+            return
+        with open(self.path, "r") as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+
+class UserProfile:
+    """Running weighted sum of similarity rows for the products a user interacted with"""
+    __slots__ = ("vector", "weight_total", "interacted", "seen")
+
+    def __init__(self, size: int):
+        self.vector = np.zeros(size)
+        self.weight_total = 0
+        self.interacted: Set[int] = set()
+        self.seen: Set[Tuple[str, str]] = set()
+
+class UserProfileStore:
+    """In-memory profile vectors kept up to date from the interaction log"""
+
+    def __init__(self, engine: RecommendationEngine, log: InteractionLog):
+        self.engine = engine
+        self.log = log
+        self.profiles: Dict[str, UserProfile] = {}
+        for event in self.log.replay():
+            self._apply(event["user_id"], event["product_id"], event["type"])
+
+    def _apply(self, user_id: str, product_id: str, interaction_type: str) -> bool:
+        profile = self.profiles.get(user_id)
+        if profile is None:
+            profile = self.profiles[user_id] = UserProfile(len(self.engine.products))
+
+        key = (interaction_type, product_id)
+        product_idx = self.engine.product_index.get(product_id)
+        if key in profile.seen or product_idx is None or interaction_type not in INTERACTION_WEIGHTS:
+            return False
+
+        weight = INTERACTION_WEIGHTS[interaction_type]
+        profile.seen.add(key)
+        profile.interacted.add(product_idx)
+        profile.vector += self.engine.similarity_matrix[product_idx] * weight
+        profile.weight_total += weight
+        return True
+
+    def record(self, user_id: str, product_id: str, interaction_type: str) -> bool:
+        """Log an interaction and fold it into the user's profile; returns False for repeats"""
+        profile = self.profiles.get(user_id)
+        if profile is not None and (interaction_type, product_id) in profile.seen:
+            return False
+        self.log.append(user_id, product_id, interaction_type)
+        return self._apply(user_id, product_id, interaction_type)
+
+    def ensure_profile(self, user_id: str, interactions: Dict[str, List[str]]) -> UserProfile:
+        """Get a user's profile, seeding it from stored interaction lists if it predates the log"""
+        if user_id not in self.profiles:
+            for interaction_type, product_ids in interactions.items():
+                for product_id in product_ids:
+                    self.record(user_id, product_id, interaction_type)
+        return self.profiles.setdefault(user_id, UserProfile(len(self.engine.products)))
+
+    def recommend(self, user_id: str, interactions: Dict[str, List[str]], n: int = 5) -> List[Dict]:
+        """Get recommendations from the user's ready-made profile vector"""
+        profile = self.ensure_profile(user_id, interactions)
+        if profile.weight_total == 0:
+            return self.engine.popularity.top(n)
+        return self.engine.recommend_from_profile(
+            profile.vector / profile.weight_total,
+            profile.interacted,
+            n
+        )
\ No newline at end of file
@@ -1,11 +1,78 @@
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 import numpy as np
-from typing import List, Dict
+from bisect import bisect_left, insort
+from typing import List, Dict, Tuple, Iterable
+import uuid
+
+# Weight different types of interactions
+INTERACTION_WEIGHTS = {
+    'viewed': 1,
+    'liked': 2,
+    'purchased': 3
+}
+
+class PopularityRanking:
+    """Products kept sorted by popularity (rating * reviews_count) so top-n is a slice"""
+
+    def __init__(self, products: List[Dict]):
+        self._products: Dict[str, Dict] = {}
+        self._keys: Dict[str, Tuple[float, int]] = {}
+        self._ranking: List[Tuple[float, int, str]] = []
+        self._next_position = 0
+        # Versions restart with the process, so the generation keeps ETags unique across restarts
+        self._generation = uuid.uuid4().hex[:8]
+        self.version = 0
+
+        for product in products:
+            self._keys[product['id']] = (-self.score(product), self._next_position)
+            self._products[product['id']] = product
+            self._next_position += 1
+        self._ranking = sorted(key + (pid,) for pid, key in self._keys.items())
+
+    @staticmethod
+    def score(product: Dict) -> float:
+        return product['rating'] * product['reviews_count']
+
+    @property
+    def etag(self) -> str:
+        return f"{self._generation}-{self.version}"
+
+    def top(self, n: int = 5) -> List[Dict]:
+        """Get the n most popular products"""
+        return [self._products[pid] for _, _, pid in self._ranking[:max(n, 0)]]
+
+    def update_product(self, product: Dict) -> None:
+        """Insert a new product or re-rank one whose rating or review count changed"""
+        pid = product['id']
+        old_key = self._keys.get(pid)
+        if old_key is not None:
+            self._ranking.pop(bisect_left(self._ranking, old_key + (pid,)))
+            position = old_key[1]
+        else:
+            position = self._next_position
+            self._next_position += 1
+
+        key = (-self.score(product), position)
+        self._keys[pid] = key
+        self._products[pid] = product
+        insort(self._ranking, key + (pid,))
+        self.version += 1
+
+    def remove_product(self, product_id: str) -> None:
+        """Drop a product from the ranking"""
+        key = self._keys.pop(product_id, None)
+        if key is None:
+            return
+        self._ranking.pop(bisect_left(self._ranking, key + (product_id,)))
+        del self._products[product_id]
+        self.version += 1
 
 class RecommendationEngine:
     def __init__(self, products: List[Dict]):
         self.products = products
+        self.product_index = {p['id']: i for i, p in enumerate(products)}
+        self.popularity = PopularityRanking(products)
         self.product_features = self._prepare_product_features()
         self.tfidf = TfidfVectorizer(stop_words='english')
         self.tfidf_matrix = self._create_tfidf_matrix()
@@ -32,24 +99,20 @@ class RecommendationEngine:
 
     def get_similar_products(self, product_id: str, n: int = 5) -> List[Dict]:
         """Get n most similar products to a given product"""
-        try:
-            # Find product index
-            product_idx = next(
-                i for i, p in enumerate(self.products) 
-                if p['id'] == product_id
-            )
-            
-            # Get similarity scores
-            similarity_scores = self.similarity_matrix[product_idx]
-            
-            # Get indices of most similar products (excluding self)
-            similar_indices = similarity_scores.argsort()[::-1][1:n+1]
-            
-            # Return similar products
-            return [self.products[i] for i in similar_indices]
-        except StopIteration:
+        # Find product index
+        product_idx = self.product_index.get(product_id)
+        if product_idx is None:
             return []
 
+        # Get similarity scores
+        similarity_scores = self.similarity_matrix[product_idx]
+
+        # Get indices of most similar products (excluding self)
+        similar_indices = similarity_scores.argsort()[::-1][1:n+1]
+
+        # Return similar products
+        return [self.products[i] for i in similar_indices]
+
     def get_personalized_recommendations(
         self, 
         user_interactions: Dict[str, List[str]], 
@@ -58,18 +121,9 @@ class RecommendationEngine:
         """Get personalized recommendations based on user interactions"""
         if not any(user_interactions.values()):
             # If no interactions, return highest rated products
-            return sorted(
-                self.products, 
-                key=lambda x: (x['rating'] * x['reviews_count']), 
-                reverse=True
-            )[:n]
-
-        # Weight different types of interactions
-        weights = {
-            'viewed': 1,
-            'liked': 2,
-            'purchased': 3
-        }
+            return self.popularity.top(n)
+
+        weights = INTERACTION_WEIGHTS
 
         # Calculate weighted average similarity
         weighted_scores = np.zeros(len(self.products))
@@ -77,18 +131,14 @@ class RecommendationEngine:
 
         for interaction_type, product_ids in user_interactions.items():
             for product_id in product_ids:
-                try:
-                    product_idx = next(
-                        i for i, p in enumerate(self.products) 
-                        if p['id'] == product_id
-                    )
-                    weighted_scores += (
-                        self.similarity_matrix[product_idx] * 
-                        weights[interaction_type]
-                    )
-                    interaction_count += weights[interaction_type]
-                except StopIteration:
+                product_idx = self.product_index.get(product_id)
+                if product_idx is None:
                     continue
+                weighted_scores += (
+                    self.similarity_matrix[product_idx] * 
+                    weights[interaction_type]
+                )
+                interaction_count += weights[interaction_type]
 
         if interaction_count > 0:
             weighted_scores /= interaction_count
@@ -108,4 +158,24 @@ class RecommendationEngine:
         masked_scores = weighted_scores * available_mask
         recommended_indices = masked_scores.argsort()[::-1][:n]
 
-        return [self.products[i] for i in recommended_indices] 
\ No newline at end of file
+        return [self.products[i] for i in recommended_indices] 
+
+    def recommend_from_profile(
+        self,
+        profile_vector: np.ndarray,
+        exclude_indices: Iterable[int],
+        n: int = 5
+    ) -> List[Dict]:
+        """Get top n products for a precomputed profile vector, skipping excluded products"""
+        scores = profile_vector.copy()
+        exclude = list(exclude_indices)
+        scores[exclude] = -np.inf
+
+        n = min(n, len(scores) - len(exclude))
+        if n <= 0:
+            return []
+
+        # Partial selection of the top n, then order just those
+        top_indices = np.argpartition(scores, -n)[-n:]
+        top_indices = top_indices[np.argsort(scores[top_indices])[::-1]]
+        return [self.products[i] for i in top_indices]
\ No newline at end of file
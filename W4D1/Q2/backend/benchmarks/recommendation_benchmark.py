@@ -0,0 +1,233 @@
+"""
+Offline quality and latency benchmark for RecommendationEngine.
+
+Generates synthetic catalogs and interaction logs, then measures engine
+construction time, peak memory, get_similar_products and
+get_personalized_recommendations latency (p50/p99) and hit-rate@k on
+held-out interactions. Results are written as JSON so runs can be diffed.
+
+Run from the backend directory:
+    python -m benchmarks.recommendation_benchmark --sizes 1000 5000 --output results.json
+"""
+import argparse
+import json
+import platform
+import random
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from app.utils.recommendations import RecommendationEngine, INTERACTION_WEIGHTS
+from app.utils.interactions import InteractionLog, UserProfileStore
+
+CATEGORIES = {
+    "Electronics": ["Audio", "Wearables", "Computers", "Cameras", "Gaming"],
+    "Home": ["Kitchen", "Furniture", "Lighting", "Decor", "Cleaning"],
+    "Sports": ["Fitness", "Outdoor", "Cycling", "Running", "Yoga"],
+    "Fashion": ["Shoes", "Bags", "Watches", "Jackets", "Accessories"],
+    "Books": ["Fiction", "Science", "History", "Cooking", "Travel"],
+}
+
+# Each subcategory draws most of its words from its own slice of the vocabulary,
+# so content similarity and user taste line up the way they do in real catalogs.
+VOCABULARY_SIZE = 5000
+WORDS_PER_SUBCATEGORY = 200
+
+def generate_catalog(n_products: int, rng: random.Random) -> List[Dict]:
+    """Generate n synthetic products with the same schema as data/products.json"""
+    vocabulary = [f"term{i}" for i in range(VOCABULARY_SIZE)]
+    subcategories = [(c, s) for c, subs in CATEGORIES.items() for s in subs]
+    topic_words = {
+        sub: rng.sample(vocabulary, WORDS_PER_SUBCATEGORY) for sub in subcategories
+    }
+
+    products = []
+    for i in range(n_products):
+        category, subcategory = rng.choice(subcategories)
+        words = topic_words[(category, subcategory)]
+        description = " ".join(rng.choices(words, k=15) + rng.choices(vocabulary, k=5))
+        products.append({
+            "id": str(i + 1),
+            "name": f"{subcategory} {' '.join(rng.choices(words, k=2))}",
+            "category": category,
+            "subcategory": subcategory,
+            "price": round(rng.uniform(5, 500), 2),
+            "description": description,
+            "features": rng.choices(words, k=4),
+            "rating": round(rng.uniform(2.5, 5.0), 1),
+            "reviews_count": rng.randint(0, 2000),
+            "tags": rng.choices(words, k=3),
+            "image_url": f"https://example.com/{i + 1}.jpg"
+        })
+    return products
+
+def generate_interactions(
+    products: List[Dict],
+    n_users: int,
+    per_user: int,
+    rng: random.Random
+) -> Dict[str, List[Tuple[str, str]]]:
+    """Generate per-user (interaction_type, product_id) histories biased toward one subcategory"""
+    by_subcategory: Dict[str, List[str]] = {}
+    for product in products:
+        by_subcategory.setdefault(product["subcategory"], []).append(product["id"])
+    subcategories = list(by_subcategory)
+    types = list(INTERACTION_WEIGHTS)
+
+    histories = {}
+    for u in range(n_users):
+        favourite = rng.choice(subcategories)
+        history = []
+        for _ in range(per_user):
+            pool = by_subcategory[favourite] if rng.random() < 0.8 else by_subcategory[rng.choice(subcategories)]
+            history.append((rng.choices(types, weights=[6, 3, 1])[0], rng.choice(pool)))
+        histories[f"user{u}"] = history
+    return histories
+
+def split_holdout(
+    histories: Dict[str, List[Tuple[str, str]]]
+) -> Tuple[Dict[str, Dict[str, List[str]]], Dict[str, str]]:
+    """Hold out each user's last interaction and turn the rest into interaction lists"""
+    train, held_out = {}, {}
+    for user_id, history in histories.items():
+        *seen, (_, last_product) = history
+        interactions = {t: [] for t in INTERACTION_WEIGHTS}
+        for interaction_type, product_id in seen:
+            if product_id not in interactions[interaction_type]:
+                interactions[interaction_type].append(product_id)
+        train[user_id] = interactions
+        seen_ids = {pid for _, pid in seen}
+        # A held-out item the user already saw can never be recommended, so skip it
+        if last_product not in seen_ids:
+            held_out[user_id] = last_product
+    return train, held_out
+
+def latency_stats(samples: List[float]) -> Dict[str, float]:
+    """Summarize latencies in milliseconds"""
+    values = np.array(samples) * 1000
+    return {
+        "calls": len(samples),
+        "p50_ms": round(float(np.percentile(values, 50)), 4),
+        "p99_ms": round(float(np.percentile(values, 99)), 4),
+        "mean_ms": round(float(values.mean()), 4)
+    }
+
+def hit_rate(recommended: Dict[str, List[str]], held_out: Dict[str, str]) -> float:
+    if not held_out:
+        return 0.0
+    hits = sum(1 for user_id, pid in held_out.items() if pid in recommended.get(user_id, []))
+    return round(hits / len(held_out), 4)
+
+def benchmark_size(n_products: int, args: argparse.Namespace) -> Dict:
+    """Run the full benchmark for one catalog size"""
+    # The engine keeps a dense N x N float64 similarity matrix
+    matrix_gb = n_products * n_products * 8 / 1024 ** 3
+    if matrix_gb > args.max_matrix_gb:
+        return {
+            "products": n_products,
+            "status": "skipped",
+            "reason": f"dense similarity matrix needs {matrix_gb:.1f} GB (limit {args.max_matrix_gb} GB)"
+        }
+
+    rng = random.Random(args.seed + n_products)
+    products = generate_catalog(n_products, rng)
+    histories = generate_interactions(products, args.users, args.interactions_per_user, rng)
+    train, held_out = split_holdout(histories)
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    engine = RecommendationEngine(products)
+    build_seconds = time.perf_counter() - started
+    _, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    similar_samples = []
+    for product_id in rng.sample([p["id"] for p in products], min(args.queries, n_products)):
+        started = time.perf_counter()
+        engine.get_similar_products(product_id, args.k)
+        similar_samples.append(time.perf_counter() - started)
+
+    personalized_samples, personalized_recs = [], {}
+    for user_id, interactions in train.items():
+        started = time.perf_counter()
+        recs = engine.get_personalized_recommendations(interactions, args.k)
+        personalized_samples.append(time.perf_counter() - started)
+        personalized_recs[user_id] = [p["id"] for p in recs]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        profile_store = UserProfileStore(engine, InteractionLog(Path(tmp) / "interactions.log"))
+        started = time.perf_counter()
+        for user_id, interactions in train.items():
+            profile_store.ensure_profile(user_id, interactions)
+        profile_build_seconds = time.perf_counter() - started
+
+        profile_samples, profile_recs = [], {}
+        for user_id, interactions in train.items():
+            started = time.perf_counter()
+            recs = profile_store.recommend(user_id, interactions, args.k)
+            profile_samples.append(time.perf_counter() - started)
+            profile_recs[user_id] = [p["id"] for p in recs]
+
+    return {
+        "products": n_products,
+        "status": "ok",
+        "users": len(train),
+        "evaluated_users": len(held_out),
+        "construction": {
+            "seconds": round(build_seconds, 4),
+            "peak_memory_mb": round(peak_bytes / 1024 ** 2, 2)
+        },
+        "get_similar_products": latency_stats(similar_samples),
+        "get_personalized_recommendations": latency_stats(personalized_samples),
+        "profile_recommendations": {
+            **latency_stats(profile_samples),
+            "profile_build_seconds": round(profile_build_seconds, 4)
+        },
+        "quality": {
+            f"hit_rate@{args.k}": hit_rate(personalized_recs, held_out),
+            f"profile_hit_rate@{args.k}": hit_rate(profile_recs, held_out),
+            f"popularity_baseline_hit_rate@{args.k}": hit_rate(
+                {u: [p["id"] for p in engine.popularity.top(args.k)] for u in held_out},
+                held_out
+            )
+        }
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark RecommendationEngine quality and latency")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 5000, 10000],
+                        help="Catalog sizes to benchmark (1k-500k)")
+    parser.add_argument("--users", type=int, default=200, help="Synthetic users per catalog")
+    parser.add_argument("--interactions-per-user", type=int, default=10)
+    parser.add_argument("--queries", type=int, default=200, help="get_similar_products calls per size")
+    parser.add_argument("--k", type=int, default=10, help="Recommendations per call and hit-rate cutoff")
+    parser.add_argument("--max-matrix-gb", type=float, default=4.0,
+                        help="Skip sizes whose dense similarity matrix would exceed this")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default="benchmark_results.json")
+    args = parser.parse_args()
+
+    results = []
+    for size in args.sizes:
+        print(f"Benchmarking {size} products...")
+        result = benchmark_size(size, args)
+        print(json.dumps(result, indent=2))
+        results.append(result)
+
+    report = {
+        "generated_at": datetime.utcnow().isoformat(),
+        "python": platform.python_version(),
+        "config": {k: v for k, v in vars(args).items() if k != "output"},
+        "results": results
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.output}")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
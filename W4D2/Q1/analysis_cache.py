@@ -0,0 +1,80 @@
+import asyncio
+import hashlib
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, List, Optional
+from utils import analyze_text
+
+# Below this many uncached documents, analysing inline beats shipping text to worker processes
+MIN_PARALLEL_BATCH = 8
+
+def content_hash(content: str) -> str:
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+class AnalysisCache:
+    """
+    analyze_text results keyed by a hash of the analysed content, so a document
+    is only analysed again when its content actually changes.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self.results: Dict[str, Dict[str, Any]] = {}
+        # doc_id -> hash of the content last analysed for it
+        self.doc_hashes: Dict[str, str] = {}
+        self._refs: Counter = Counter()
+        self.max_workers = max_workers
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def _track(self, doc_id: str, digest: str) -> None:
+        old = self.doc_hashes.get(doc_id)
+        if old == digest:
+            return
+        self.doc_hashes[doc_id] = digest
+        self._refs[digest] += 1
+        if old is not None:
+            # Content changed: drop the old result unless another document shares it
+            self._refs[old] -= 1
+            if self._refs[old] <= 0:
+                del self._refs[old]
+                self.results.pop(old, None)
+
+    def analyze_document(self, document: Dict[str, Any]) -> Dict[str, Any]:
+        """Get the cached analysis for a document, computing it if the content is new"""
+        digest = content_hash(document['content'])
+        self._track(document['id'], digest)
+        analysis = self.results.get(digest)
+        if analysis is None:
+            analysis = self.results[digest] = analyze_text(document['content'])
+        return analysis
+
+    def precompute(self, documents: List[Dict[str, Any]]) -> None:
+        """Eagerly analyse documents so the first request for them is a cache hit"""
+        for document in documents:
+            self.analyze_document(document)
+
+    async def analyze_many(self, documents: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """Analyse many documents, fanning uncached content out to a process pool"""
+        pending: Dict[str, str] = {}
+        for document in documents:
+            digest = content_hash(document['content'])
+            self._track(document['id'], digest)
+            if digest not in self.results:
+                pending[digest] = document['content']
+
+        if len(pending) >= MIN_PARALLEL_BATCH:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+            loop = asyncio.get_running_loop()
+            digests = list(pending)
+            analyses = await asyncio.gather(*(
+                loop.run_in_executor(self._pool, analyze_text, pending[d]) for d in digests
+            ))
+            self.results.update(zip(digests, analyses))
+        else:
+            for digest, content in pending.items():
+                self.results[digest] = analyze_text(content)
+
+        return {
+            document['id']: self.results[self.doc_hashes[document['id']]]
+            for document in documents
+        }
\ No newline at end of file
@@ -0,0 +1,158 @@
+import heapq
+import math
+import re
+from collections import defaultdict
+from typing import Dict, List, Any, Tuple
+
+TOKEN_PATTERN = re.compile(r'\b\w+\b')
+PHRASE_PATTERN = re.compile(r'"([^"]+)"')
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+# A title hit counts as this many content hits
+TITLE_BOOST = 2
+
+# Characters of context shown on each side of the first match in a snippet
+SNIPPET_RADIUS = 80
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_PATTERN.findall(text.lower())
+
+class DocumentIndex:
+    """
+    Positional inverted index over document titles and content with BM25 ranking.
+    Documents can be added or removed one at a time, so the index never needs a rebuild.
+    """
+
+    def __init__(self):
+        # term -> {doc_id: [positions]}; title tokens come first, content is offset past them
+        self.postings: Dict[str, Dict[str, List[int]]] = defaultdict(dict)
+        # doc_id -> {term: weighted term frequency}
+        self.term_freqs: Dict[str, Dict[str, int]] = {}
+        self.doc_lengths: Dict[str, int] = {}
+        self.documents: Dict[str, Dict[str, Any]] = {}
+        self.total_length = 0
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    def add_document(self, document: Dict[str, Any]) -> None:
+        """Index a document, replacing any earlier version with the same id"""
+        doc_id = document['id']
+        if doc_id in self.documents:
+            self.remove_document(doc_id)
+
+        title_tokens = tokenize(document['title'])
+        content_tokens = tokenize(document['content'])
+        freqs: Dict[str, int] = defaultdict(int)
+
+        for position, term in enumerate(title_tokens):
+            self.postings[term].setdefault(doc_id, []).append(position)
+            freqs[term] += TITLE_BOOST
+        # Leave a gap so phrases can't span the title and content
+        offset = len(title_tokens) + 1
+        for position, term in enumerate(content_tokens, start=offset):
+            self.postings[term].setdefault(doc_id, []).append(position)
+            freqs[term] += 1
+
+        length = len(content_tokens) + TITLE_BOOST * len(title_tokens)
+        self.term_freqs[doc_id] = dict(freqs)
+        self.doc_lengths[doc_id] = length
+        self.documents[doc_id] = document
+        self.total_length += length
+
+    def remove_document(self, doc_id: str) -> None:
+        """Drop a document and its postings"""
+        freqs = self.term_freqs.pop(doc_id, None)
+        if freqs is None:
+            return
+        for term in freqs:
+            postings = self.postings[term]
+            postings.pop(doc_id, None)
+            if not postings:
+                del self.postings[term]
+        self.total_length -= self.doc_lengths.pop(doc_id)
+        del self.documents[doc_id]
+
+    def _idf(self, term: str) -> float:
+        df = len(self.postings.get(term, ()))
+        return math.log(1 + (len(self.documents) - df + 0.5) / (df + 0.5))
+
+    def _phrase_matches(self, phrase: List[str]) -> set:
+        """Doc ids containing the phrase terms at consecutive positions"""
+        if any(term not in self.postings for term in phrase):
+            return set()
+        first, rest = phrase[0], phrase[1:]
+        candidates = set(self.postings[first])
+        for term in rest:
+            candidates &= self.postings[term].keys()
+
+        matches = set()
+        for doc_id in candidates:
+            following = [set(self.postings[term][doc_id]) for term in rest]
+            for start in self.postings[first][doc_id]:
+                if all(start + i + 1 in positions for i, positions in enumerate(following)):
+                    matches.add(doc_id)
+                    break
+        return matches
+
+    def search(self, query: str, limit: int = 10) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Rank documents for a query. Quoted parts are phrases every result must contain;
+        other words are scored with BM25. Returns (top results, total matching documents).
+        """
+        phrases = [tokenize(p) for p in PHRASE_PATTERN.findall(query)]
+        phrases = [p for p in phrases if p]
+        terms = set(tokenize(PHRASE_PATTERN.sub(' ', query)))
+        terms.update(term for phrase in phrases for term in phrase)
+
+        avg_length = self.total_length / len(self.documents) if self.documents else 0
+        scores: Dict[str, float] = defaultdict(float)
+        for term in terms:
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            idf = self._idf(term)
+            for doc_id in postings:
+                tf = self.term_freqs[doc_id][term]
+                norm = K1 * (1 - B + B * self.doc_lengths[doc_id] / avg_length)
+                scores[doc_id] += idf * tf * (K1 + 1) / (tf + norm)
+
+        if phrases:
+            allowed = set(scores)
+            for phrase in phrases:
+                allowed &= self._phrase_matches(phrase)
+            scores = {doc_id: score for doc_id, score in scores.items() if doc_id in allowed}
+
+        # Only the top `limit` are ordered; ties break on id as a full sort would
+        top = heapq.nsmallest(max(limit, 0), scores.items(), key=lambda item: (-item[1], item[0]))
+        results = []
+        for doc_id, score in top:
+            document = self.documents[doc_id]
+            results.append({
+                "id": doc_id,
+                "title": document['title'],
+                "score": round(score, 4),
+                "snippet": self.snippet(document['content'], terms)
+            })
+        return results, len(scores)
+
+    @staticmethod
+    def snippet(content: str, terms: set) -> str:
+        """Extract a window of text around the first query term in the content"""
+        for match in TOKEN_PATTERN.finditer(content):
+            if match.group().lower() in terms:
+                start = max(match.start() - SNIPPET_RADIUS, 0)
+                end = min(match.end() + SNIPPET_RADIUS, len(content))
+                break
+        else:
+            start, end = 0, min(2 * SNIPPET_RADIUS, len(content))
+
+        snippet = content[start:end].strip()
+        if start > 0:
+            snippet = "..." + snippet
+        if end < len(content):
+            snippet += "..."
+        return snippet
\ No newline at end of file
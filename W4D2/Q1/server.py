@@ -1,22 +1,41 @@
-import json
+import codecs
 import os
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
 from fastmcp import FastMCP, Context
-from utils import analyze_text, get_sentiment, extract_keywords
+from utils import get_sentiment, extract_keywords, TextStats, CHUNK_SIZE
+from search_index import DocumentIndex
+from storage import DocumentStore
+from analysis_cache import AnalysisCache
 
 app = FastMCP()
 
 # Get the directory where server.py is located
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 DOCUMENTS_PATH = os.path.join(BASE_DIR, 'documents.json')
+DOCUMENTS_LOG_PATH = os.path.join(BASE_DIR, 'documents.jsonl')
 
-# Load documents from JSON file
-with open(DOCUMENTS_PATH, 'r') as f:
-    DOCUMENTS = json.load(f)['documents']
+# Streaming tools only read files under this directory
+STREAM_BASE_DIR = os.path.realpath(os.getenv('STREAM_BASE_DIR', os.path.join(BASE_DIR, 'texts')))
+
+# Streaming tools report progress after this many chunks (about 1 MB of text)
+PROGRESS_EVERY_CHUNKS = 16
+
+# Load documents from the JSON snapshot plus the append-only log
+STORE = DocumentStore(DOCUMENTS_PATH, DOCUMENTS_LOG_PATH)
+DOCUMENTS = STORE.load()
 
 # In-memory document storage (dictionary for faster lookups)
 DOCUMENTS_DICT = {doc['id']: doc for doc in DOCUMENTS}
 
+# Inverted index for search, built once here and updated as documents are added
+SEARCH_INDEX = DocumentIndex()
+for doc in DOCUMENTS:
+    SEARCH_INDEX.add_document(doc)
+
+# Analysis results keyed by content hash, computed up front for every loaded document
+ANALYSIS_CACHE = AnalysisCache()
+ANALYSIS_CACHE.precompute(DOCUMENTS)
+
 @app.tool("analyze_document")
 async def analyze_document(document_id: str, ctx: Context) -> Dict[str, Any]:
     """Analyze a specific document by ID"""
@@ -25,13 +44,30 @@ async def analyze_document(document_id: str, ctx: Context) -> Dict[str, Any]:
         return {"error": "Document not found"}
     
     document = DOCUMENTS_DICT[document_id]
-    analysis = analyze_text(document['content'])
+    analysis = ANALYSIS_CACHE.analyze_document(document)
     
     return {
         "document": document,
         "analysis": analysis
     }
 
+@app.tool("analyze_documents")
+async def analyze_documents(document_ids: List[str], ctx: Context) -> Dict[str, Any]:
+    """Analyze many documents by ID at once"""
+    if not document_ids:
+        ctx.error("No document IDs provided")
+        return {"error": "No document IDs provided"}
+    
+    documents = [DOCUMENTS_DICT[doc_id] for doc_id in document_ids if doc_id in DOCUMENTS_DICT]
+    missing = [doc_id for doc_id in document_ids if doc_id not in DOCUMENTS_DICT]
+    
+    analyses = await ANALYSIS_CACHE.analyze_many(documents)
+    
+    return {
+        "analyses": analyses,
+        "not_found": missing
+    }
+
 @app.tool("get_sentiment")
 async def analyze_sentiment(text: str, ctx: Context) -> Dict[str, str]:
     """Analyze sentiment of provided text"""
@@ -58,6 +94,90 @@ async def get_keywords(text: str, ctx: Context, limit: int = 5) -> Dict[str, Any
     keywords = extract_keywords(text, limit)
     return {"keywords": keywords}
 
+async def stream_text_stats(
+    ctx: Context,
+    path: Optional[str] = None,
+    chunks: Optional[List[str]] = None
+) -> TextStats:
+    """Scan a file or a list of text chunks in constant memory, reporting progress as it goes"""
+    stats = TextStats()
+    if path:
+        total = os.path.getsize(path)
+        decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        done = 0
+        with open(path, 'rb') as f:
+            for i, block in enumerate(iter(lambda: f.read(CHUNK_SIZE), b'')):
+                stats.feed(decoder.decode(block))
+                done += len(block)
+                if (i + 1) % PROGRESS_EVERY_CHUNKS == 0:
+                    await ctx.report_progress(done, total)
+        stats.feed(decoder.decode(b'', final=True))
+        await ctx.report_progress(total, total)
+    else:
+        for i, chunk in enumerate(chunks):
+            stats.feed(chunk)
+            if (i + 1) % PROGRESS_EVERY_CHUNKS == 0:
+                await ctx.report_progress(i + 1, len(chunks))
+        await ctx.report_progress(len(chunks), len(chunks))
+    return stats.finish()
+
+def validate_stream_source(path: Optional[str], chunks: Optional[List[str]]) -> Tuple[Optional[str], Optional[str]]:
+    """Return (resolved path, error); paths are relative to STREAM_BASE_DIR and may not leave it"""
+    if not path and not chunks:
+        return None, "Provide a file path or text chunks"
+    if not path:
+        return None, None
+    resolved = os.path.realpath(os.path.join(STREAM_BASE_DIR, path))
+    if os.path.commonpath([resolved, STREAM_BASE_DIR]) != STREAM_BASE_DIR:
+        return None, f"Path is outside the streaming directory: {path}"
+    if not os.path.isfile(resolved):
+        return None, f"File not found: {path}"
+    return resolved, None
+
+@app.tool("get_sentiment_stream")
+async def analyze_sentiment_stream(
+    ctx: Context,
+    path: Optional[str] = None,
+    chunks: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    """Analyze sentiment of a large text given as a file path (under STREAM_BASE_DIR) or a list of chunks"""
+    path, error = validate_stream_source(path, chunks)
+    if error:
+        ctx.error(error)
+        return {"error": error}
+    
+    stats = await stream_text_stats(ctx, path, chunks)
+    return {
+        "sentiment": stats.sentiment(),
+        "word_count": stats.word_count,
+        "sentence_count": stats.sentence_count
+    }
+
+@app.tool("extract_keywords_stream")
+async def get_keywords_stream(
+    ctx: Context,
+    path: Optional[str] = None,
+    chunks: Optional[List[str]] = None,
+    limit: int = 5
+) -> Dict[str, Any]:
+    """Extract keywords from a large text given as a file path (under STREAM_BASE_DIR) or a list of chunks"""
+    path, error = validate_stream_source(path, chunks)
+    if error:
+        ctx.error(error)
+        return {"error": error}
+    
+    try:
+        limit = int(limit)
+    except (TypeError, ValueError):
+        ctx.error("Invalid limit value")
+        return {"error": "Invalid limit value"}
+    
+    stats = await stream_text_stats(ctx, path, chunks)
+    return {
+        "keywords": stats.keywords(limit),
+        "word_count": stats.word_count
+    }
+
 @app.tool("add_document")
 async def add_document(id: str, title: str, content: str, ctx: Context) -> Dict[str, Any]:
     """Add a new document to the collection"""
@@ -71,34 +191,66 @@ async def add_document(id: str, title: str, content: str, ctx: Context) -> Dict[
         ctx.error(f"Document ID {id} already exists")
         return {"error": "Document ID already exists"}
     
-    DOCUMENTS.append(document_data)
+    # Append to the log instead of rewriting the whole documents file
+    STORE.append([document_data])
     DOCUMENTS_DICT[document_data['id']] = document_data
-    
-    # Save the updated documents to file
-    with open(DOCUMENTS_PATH, 'w') as f:
-        json.dump({"documents": DOCUMENTS}, f, indent=4)
+    SEARCH_INDEX.add_document(document_data)
+    ANALYSIS_CACHE.analyze_document(document_data)
     
     return {"message": "Document added successfully", "document": document_data}
 
+@app.tool("add_documents")
+async def add_documents(documents: List[Dict[str, str]], ctx: Context) -> Dict[str, Any]:
+    """Add a batch of documents (each with id, title and content) in a single write"""
+    if not documents:
+        ctx.error("No documents provided")
+        return {"error": "No documents provided"}
+    
+    batch = []
+    batch_ids = set()
+    errors = []
+    for doc in documents:
+        doc_id = doc.get("id")
+        if not doc_id or "title" not in doc or "content" not in doc:
+            errors.append({"id": doc_id, "error": "Document requires id, title and content"})
+        elif doc_id in DOCUMENTS_DICT or doc_id in batch_ids:
+            errors.append({"id": doc_id, "error": "Document ID already exists"})
+        else:
+            batch.append({"id": doc_id, "title": doc["title"], "content": doc["content"]})
+            batch_ids.add(doc_id)
+    
+    STORE.append(batch)
+    for document_data in batch:
+        DOCUMENTS_DICT[document_data['id']] = document_data
+        SEARCH_INDEX.add_document(document_data)
+    await ANALYSIS_CACHE.analyze_many(batch)
+    
+    return {
+        "message": f"Added {len(batch)} documents",
+        "added": [doc["id"] for doc in batch],
+        "errors": errors
+    }
+
 @app.tool("search_documents")
-async def search_documents(query: str, ctx: Context) -> Dict[str, Any]:
-    """Search documents by keyword"""
+async def search_documents(query: str, ctx: Context, limit: int = 10) -> Dict[str, Any]:
+    """Search documents by keyword, ranked by relevance. Use "quotes" for exact phrases."""
     if not query:
         ctx.error("No search query provided")
         return {"error": "No search query provided"}
     
-    # Simple keyword matching in title and content
-    results = []
-    query = query.lower()
-    for doc in DOCUMENTS:
-        if (query in doc['title'].lower() or 
-            query in doc['content'].lower()):
-            results.append(doc)
+    try:
+        limit = int(limit)
+    except (TypeError, ValueError):
+        ctx.error("Invalid limit value")
+        return {"error": "Invalid limit value"}
+    
+    # Ranked matches with a snippet around the first hit instead of whole documents
+    results, total = SEARCH_INDEX.search(query, limit)
     
     return {
         "query": query,
         "results": results,
-        "count": len(results)
+        "count": total
     }
 
 if __name__ == "__main__":
@@ -0,0 +1,98 @@
+import json
+import os
+from typing import Dict, Any, List
+
+# Fold the append log into a fresh snapshot once it holds this many documents
+COMPACT_EVERY = 1000
+
+class DocumentStore:
+    """
+    Document persistence as a JSON snapshot plus an append-only JSONL log.
+    New documents are appended to the log (one write and fsync per batch);
+    the log is periodically compacted into the snapshot via an atomic rename.
+    """
+
+    def __init__(self, snapshot_path: str, log_path: str, compact_every: int = COMPACT_EVERY):
+        self.snapshot_path = snapshot_path
+        self.log_path = log_path
+        self.compact_every = compact_every
+        self.documents: List[Dict[str, Any]] = []
+        self.log_entries = 0
+
+    def load(self) -> List[Dict[str, Any]]:
+        """Read the snapshot, then replay any documents appended since it was written"""
+        self.documents.clear()
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, 'r') as f:
+                self.documents.extend(json.load(f)['documents'])
+
+        # A crash between writing a snapshot and resetting the log leaves documents in both;
+        # replay by id so those are replaced rather than added twice
+        positions = {doc['id']: i for i, doc in enumerate(self.documents)}
+        self.log_entries = 0
+        if os.path.exists(self.log_path):
+            valid_bytes = 0
+            with open(self.log_path, 'rb') as f:
+                for line in f:
+                    try:
+                        document = json.loads(line)
+                    except json.JSONDecodeError:
+                        break
+                    position = positions.get(document['id'])
+                    if position is None:
+                        positions[document['id']] = len(self.documents)
+                        self.documents.append(document)
+                    else:
+                        self.documents[position] = document
+                    valid_bytes += len(line)
+                    self.log_entries += 1
+            # A crash mid-append can leave a torn last line; cut it off so later appends start clean
+            if valid_bytes < os.path.getsize(self.log_path):
+                with open(self.log_path, 'r+b') as f:
+                    f.truncate(valid_bytes)
+
+        if self.log_entries >= self.compact_every:
+            self.compact()
+        return self.documents
+
+    def append(self, documents: List[Dict[str, Any]]) -> None:
+        """Durably append a batch of documents in a single write"""
+        if not documents:
+            return
+        payload = ''.join(json.dumps(doc) + '\n' for doc in documents)
+        with open(self.log_path, 'a') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+
+        self.documents.extend(documents)
+        self.log_entries += len(documents)
+        if self.log_entries >= self.compact_every:
+            self.compact()
+
+    def compact(self) -> None:
+        """Write all documents to a new snapshot atomically, then reset the log"""
+        tmp_path = self.snapshot_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump({"documents": self.documents}, f, indent=4)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.snapshot_path)
+        self._fsync_dir()
+
+        # The snapshot now holds every logged document, so the log can start over
+        with open(self.log_path, 'w') as f:
+            f.flush()
+            os.fsync(f.fileno())
+        self.log_entries = 0
+
+    def _fsync_dir(self) -> None:
+        """Persist the rename itself (no-op where directories can't be opened, e.g. Windows)"""
+        try:
+            fd = os.open(os.path.dirname(os.path.abspath(self.snapshot_path)), os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
\ No newline at end of file
@@ -1,93 +1,176 @@
 import re
 from collections import Counter
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable
+
+POSITIVE_WORDS = frozenset({
+    'good', 'great', 'excellent', 'beneficial', 'helpful', 'positive',
+    'improve', 'better', 'best', 'success', 'successful', 'benefit',
+    'essential', 'important', 'crucial', 'significant', 'efficient'
+})
+
+NEGATIVE_WORDS = frozenset({
+    'bad', 'poor', 'terrible', 'harmful', 'negative', 'worst',
+    'difficult', 'hard', 'problem', 'threat', 'dangerous', 'risk',
+    'challenge', 'concern', 'critical', 'urgent', 'struggle'
+})
+
+STOP_WORDS = frozenset({
+    'the', 'be', 'to', 'of', 'and', 'a', 'in', 'that', 'have',
+    'i', 'it', 'for', 'not', 'on', 'with', 'he', 'as', 'you',
+    'do', 'at', 'this', 'but', 'his', 'by', 'from', 'they',
+    'we', 'say', 'her', 'she', 'or', 'an', 'will', 'my', 'one',
+    'all', 'would', 'there', 'their', 'what', 'so', 'up', 'out',
+    'if', 'about', 'who', 'get', 'which', 'go', 'me', 'is', 'are',
+    'was', 'were', 'has', 'can', 'more', 'now'
+})
+
+# Words, runs of sentence terminators, and any other punctuation, found in one scan
+TOKEN_PATTERN = re.compile(r'\w+|[.!?]+|[^\w\s.!?]+')
+SENTENCE_TERMINATORS = frozenset('.!?')
+WORD_PATTERN = re.compile(r'\w')
+
+# Large texts are scanned in slices of this many characters
+CHUNK_SIZE = 1 << 16
+
+# Longest run without whitespace held back between chunks; longer runs are scanned in pieces
+MAX_CARRY = 1 << 16
+
+class TextStats:
+    """
+    Accumulates every metric analyze_text reports from a single tokenization pass.
+    Text can be fed in chunks of any size; a partial word at the end of a chunk is
+    held back until the next one, so results match analysing the whole text at once
+    (unless a run without whitespace grows past MAX_CARRY, which is then split).
+    """
+
+    def __init__(self):
+        self.token_counts: Counter = Counter()
+        self.sentence_count = 0
+        self._in_sentence = False
+        self._carry: List[str] = []
+        self._carry_length = 0
+
+    def feed(self, chunk: str) -> None:
+        # Tokens never contain whitespace, so cutting at the chunk's last whitespace can't split one
+        cut = len(chunk)
+        while cut and not chunk[cut - 1].isspace():
+            cut -= 1
+        if cut:
+            self._carry.append(chunk[:cut])
+            self._scan(''.join(self._carry))
+            self._carry.clear()
+            self._carry_length = 0
+            chunk = chunk[cut:]
+        if chunk:
+            self._carry.append(chunk)
+            self._carry_length += len(chunk)
+            if self._carry_length > MAX_CARRY:
+                self._flush_carry()
+
+    def _flush_carry(self) -> None:
+        if self._carry:
+            self._scan(''.join(self._carry))
+            self._carry.clear()
+            self._carry_length = 0
+
+    def finish(self) -> 'TextStats':
+        """Flush any held-back text and close the last sentence"""
+        self._flush_carry()
+        if self._in_sentence:
+            self.sentence_count += 1
+            self._in_sentence = False
+        return self
+
+    def _scan(self, text: str) -> None:
+        tokens = TOKEN_PATTERN.findall(text.lower())
+        self.token_counts.update(tokens)
+
+        # A sentence ends at a terminator run that follows any other token
+        in_sentence = self._in_sentence
+        sentences = 0
+        for token in tokens:
+            if token[0] in SENTENCE_TERMINATORS:
+                if in_sentence:
+                    sentences += 1
+                    in_sentence = False
+            else:
+                in_sentence = True
+        self.sentence_count += sentences
+        self._in_sentence = in_sentence
+
+    def word_counts(self) -> Iterable:
+        """(word, count) pairs in first-seen order"""
+        return ((t, c) for t, c in self.token_counts.items() if WORD_PATTERN.match(t))
+
+    @property
+    def word_count(self) -> int:
+        return sum(c for _, c in self.word_counts())
+
+    def sentiment(self) -> str:
+        positive_count = sum(self.token_counts[w] for w in POSITIVE_WORDS)
+        negative_count = sum(self.token_counts[w] for w in NEGATIVE_WORDS)
+
+        if positive_count > negative_count:
+            return 'positive'
+        elif negative_count > positive_count:
+            return 'negative'
+        return 'neutral'
+
+    def keywords(self, limit: int = 5) -> List[str]:
+        word_freq = Counter({
+            word: count for word, count in self.word_counts()
+            if word not in STOP_WORDS and len(word) > 2
+        })
+        return [word for word, _ in word_freq.most_common(limit)]
+
+    def readability(self) -> Dict[str, Any]:
+        word_count = self.word_count
+        sentence_count = self.sentence_count
+        avg_words_per_sentence = word_count / sentence_count if sentence_count > 0 else 0
+
+        return {
+            'sentence_count': sentence_count,
+            'word_count': word_count,
+            'avg_words_per_sentence': round(avg_words_per_sentence, 2)
+        }
+
+def scan_text(text: str) -> TextStats:
+    """Run the single-pass scan over a whole string, slice by slice"""
+    stats = TextStats()
+    for start in range(0, len(text), CHUNK_SIZE):
+        stats.feed(text[start:start + CHUNK_SIZE])
+    return stats.finish()
 
 def get_sentiment(text: str) -> str:
     """
     A simple sentiment analysis implementation using keyword matching.
     Returns 'positive', 'negative', or 'neutral'.
     """
-    positive_words = {
-        'good', 'great', 'excellent', 'beneficial', 'helpful', 'positive',
-        'improve', 'better', 'best', 'success', 'successful', 'benefit',
-        'essential', 'important', 'crucial', 'significant', 'efficient'
-    }
-    
-    negative_words = {
-        'bad', 'poor', 'terrible', 'harmful', 'negative', 'worst',
-        'difficult', 'hard', 'problem', 'threat', 'dangerous', 'risk',
-        'challenge', 'concern', 'critical', 'urgent', 'struggle'
-    }
-    
-    words = text.lower().split()
-    positive_count = sum(1 for word in words if word in positive_words)
-    negative_count = sum(1 for word in words if word in negative_words)
-    
-    if positive_count > negative_count:
-        return 'positive'
-    elif negative_count > positive_count:
-        return 'negative'
-    return 'neutral'
+    return scan_text(text).sentiment()
 
 def extract_keywords(text: str, limit: int = 5) -> List[str]:
     """
     Extract keywords using a simple frequency-based approach.
     Excludes common stop words.
     """
-    stop_words = {
-        'the', 'be', 'to', 'of', 'and', 'a', 'in', 'that', 'have',
-        'i', 'it', 'for', 'not', 'on', 'with', 'he', 'as', 'you',
-        'do', 'at', 'this', 'but', 'his', 'by', 'from', 'they',
-        'we', 'say', 'her', 'she', 'or', 'an', 'will', 'my', 'one',
-        'all', 'would', 'there', 'their', 'what', 'so', 'up', 'out',
-        'if', 'about', 'who', 'get', 'which', 'go', 'me', 'is', 'are',
-        'was', 'were', 'has', 'can', 'more', 'now'
-    }
-    
-    # Clean text and split into words
-    words = re.findall(r'\b\w+\b', text.lower())
-    
-    # Remove stop words and count frequencies
-    words = [word for word in words if word not in stop_words and len(word) > 2]
-    word_freq = Counter(words)
-    
-    # Return top keywords
-    return [word for word, _ in word_freq.most_common(limit)]
+    return scan_text(text).keywords(limit)
 
 def calculate_readability(text: str) -> Dict[str, Any]:
     """
     Calculate basic readability metrics including word count,
     sentence count, and average words per sentence.
     """
-    # Split into sentences (simple implementation)
-    sentences = re.split(r'[.!?]+', text)
-    sentences = [s.strip() for s in sentences if s.strip()]
-    
-    # Count words
-    words = re.findall(r'\b\w+\b', text)
-    
-    # Calculate metrics
-    sentence_count = len(sentences)
-    word_count = len(words)
-    avg_words_per_sentence = word_count / sentence_count if sentence_count > 0 else 0
-    
-    return {
-        'sentence_count': sentence_count,
-        'word_count': word_count,
-        'avg_words_per_sentence': round(avg_words_per_sentence, 2)
-    }
+    return scan_text(text).readability()
 
 def analyze_text(text: str) -> Dict[str, Any]:
     """
     Perform complete text analysis including sentiment,
     keywords, and readability metrics.
     """
-    sentiment = get_sentiment(text)
-    keywords = extract_keywords(text)
-    readability = calculate_readability(text)
-    
+    stats = scan_text(text)
+
     return {
-        'sentiment': sentiment,
-        'keywords': keywords,
-        'readability': readability
-    } 
\ No newline at end of file
+        'sentiment': stats.sentiment(),
+        'keywords': stats.keywords(),
+        'readability': stats.readability()
+    }
\ No newline at end of file
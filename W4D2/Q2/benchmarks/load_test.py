@@ -0,0 +1,293 @@
+"""
+Load test for the meeting scheduler's storage and scheduling paths.
+
+Fills each store implementation with a synthetic organisation (teams of users in
+several timezones, months of meetings), then drives the work behind the
+create_meeting, find_optimal_slots, analyze_meeting_patterns and
+calculate_workload_balance tools from concurrent clients. Reports load time,
+throughput, p50/p99 latency per operation against the SLOs below, and memory.
+Each store runs in its own process so memory figures don't mix. Results are
+written as JSON so runs can be diffed between releases.
+
+Run from the W4D2/Q2 directory:
+    python -m benchmarks.load_test --users 1000 --meetings 1000000 --output results.json
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import resource
+import tempfile
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, timedelta
+from itertools import islice
+from typing import Dict, List
+
+import pytz
+
+from src.models import Meeting, User
+from src.persistence import SQLiteStore
+from src.scheduling import find_free_slots
+from src.storage import MemoryStore
+
+TIMEZONES = ["UTC", "Europe/London", "Europe/Berlin", "America/New_York", "America/Los_Angeles", "Asia/Kolkata", "Asia/Tokyo"]
+DURATIONS = [15, 30, 30, 45, 60, 60, 90, 120]
+TEAM_SIZE = 10
+
+# Meetings written per store.batch() while loading, so persistent stores don't queue millions of rows
+LOAD_BATCH = 10000
+
+# Share of each operation in the request mix
+OPERATION_MIX = {
+    "create_meeting": 0.2,
+    "find_optimal_slots": 0.3,
+    "analyze_meeting_patterns": 0.3,
+    "calculate_workload_balance": 0.2
+}
+
+# p99 latency targets in milliseconds
+SLO_P99_MS = {
+    "create_meeting": 5.0,
+    "find_optimal_slots": 50.0,
+    "analyze_meeting_patterns": 5.0,
+    "calculate_workload_balance": 20.0
+}
+
+def generate_org(n_users: int, rng: random.Random) -> List[User]:
+    """Users in teams of TEAM_SIZE; each team shares a timezone."""
+    users = []
+    for i in range(n_users):
+        team = i // TEAM_SIZE
+        users.append(User(
+            id=f"user{i}",
+            timezone=TIMEZONES[team % len(TIMEZONES)],
+            working_hours={"start": rng.choice(["08:00", "09:00", "10:00"]), "end": rng.choice(["16:00", "17:00", "18:00"])}
+        ))
+    return users
+
+def generate_meetings(users: List[User], n_meetings: int, start: datetime, days: int, rng: random.Random):
+    """Meetings over `days` days, mostly within a team, on a 15-minute grid in UTC working time."""
+    n_users = len(users)
+    for i in range(n_meetings):
+        organizer = rng.randrange(n_users)
+        team_start = organizer - organizer % TEAM_SIZE
+        team = list(range(team_start, min(team_start + TEAM_SIZE, n_users)))
+        size = min(rng.choice([2, 2, 3, 4, 6]), len(team))
+        participants = {organizer, *rng.sample(team, size - 1)}
+        # The odd cross-team guest
+        if rng.random() < 0.1:
+            participants.add(rng.randrange(n_users))
+        yield Meeting(
+            id=f"m{i}",
+            title=f"Meeting {i}",
+            participants=[f"user{p}" for p in participants],
+            start_time=start + timedelta(days=rng.randrange(days), minutes=rng.randrange(7 * 4, 19 * 4) * 15),
+            duration=rng.choice(DURATIONS),
+            agenda=["Updates"]
+        )
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    """Summarize latencies in milliseconds"""
+    if not samples:
+        return {"calls": 0}
+    values = sorted(s * 1000 for s in samples)
+
+    def pick(q: float) -> float:
+        return round(values[min(len(values) - 1, int(q * len(values)))], 4)
+
+    return {
+        "calls": len(values),
+        "p50_ms": pick(0.50),
+        "p99_ms": pick(0.99),
+        "mean_ms": round(sum(values) / len(values), 4)
+    }
+
+def max_rss_mb() -> float:
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(rss / (1024 ** 2 if platform.system() == "Darwin" else 1024), 2)
+
+class Operations:
+    """
+    The work each tool does, run against one store. Calls are serialized the way the
+    server's event loop runs handlers; time spent holding the lock is the service time.
+    """
+
+    def __init__(self, store: MemoryStore, users: List[User], start: datetime, days: int):
+        self.store = store
+        self.users = users
+        self.start = start
+        self.days = days
+        self._lock = threading.Lock()
+        self.local = threading.local()
+
+    @contextmanager
+    def serialized(self):
+        with self._lock:
+            began = time.perf_counter()
+            try:
+                yield
+            finally:
+                self.local.service = time.perf_counter() - began
+
+    def create_meeting(self, rng: random.Random) -> None:
+        participants = [u.id for u in rng.sample(self.users, 3)]
+        meeting = Meeting(
+            id=str(uuid.uuid4()),
+            title="Load test",
+            participants=participants,
+            start_time=self.start + timedelta(days=rng.randrange(self.days), minutes=rng.randrange(96) * 15),
+            duration=rng.choice(DURATIONS)
+        )
+        end = meeting.start_time + timedelta(minutes=meeting.duration)
+        with self.serialized():
+            conflicts = [
+                m for p in participants
+                for m in self.store.get_user_meetings_overlapping(p, meeting.start_time, end)
+            ]
+            if not conflicts:
+                self.store.add_meeting(meeting)
+
+    def find_optimal_slots(self, rng: random.Random) -> None:
+        participants = [u.id for u in rng.sample(self.users, rng.randint(2, 5))]
+        day = self.start + timedelta(days=rng.randrange(self.days - 5))
+        with self.serialized():
+            find_free_slots(self.store, participants, 30, day, day + timedelta(days=5))
+
+    def analyze_meeting_patterns(self, rng: random.Random) -> None:
+        user = rng.choice(self.users).id
+        end = self.start + timedelta(days=self.days)
+        with self.serialized():
+            self.store.get_user_meeting_summary(user, end - timedelta(days=30), end)
+
+    def calculate_workload_balance(self, rng: random.Random) -> None:
+        team_start = rng.randrange(0, len(self.users), TEAM_SIZE)
+        team = self.users[team_start:team_start + TEAM_SIZE]
+        end = self.start + timedelta(days=self.days)
+        with self.serialized():
+            for member in team:
+                self.store.get_user_meeting_summary(member.id, end - timedelta(days=7), end)
+
+def build_store(kind: str, workdir: str) -> MemoryStore:
+    if kind == "memory":
+        return MemoryStore()
+    if kind == "sqlite":
+        return SQLiteStore(os.path.join(workdir, "load_test.db"))
+    raise ValueError(f"Unknown store: {kind}")
+
+def benchmark_store(kind: str, args: argparse.Namespace) -> Dict:
+    """Load one store and run the concurrent request mix against it"""
+    rng = random.Random(args.seed)
+    start = datetime(2024, 1, 1, tzinfo=pytz.UTC)
+    users = generate_org(args.users, rng)
+    rss_before = max_rss_mb()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        store = build_store(kind, workdir)
+        started = time.perf_counter()
+        with store.batch():
+            for user in users:
+                store.add_user(user)
+        meetings = generate_meetings(users, args.meetings, start, args.days, rng)
+        for _ in range(0, args.meetings, LOAD_BATCH):
+            with store.batch():
+                for meeting in islice(meetings, LOAD_BATCH):
+                    store.add_meeting(meeting)
+        load_seconds = time.perf_counter() - started
+        rss_loaded = max_rss_mb()
+
+        operations = Operations(store, users, start, args.days)
+        names = list(OPERATION_MIX)
+        plan = rng.choices(names, weights=[OPERATION_MIX[n] for n in names], k=args.operations)
+        service: Dict[str, List[float]] = {name: [] for name in names}
+        end_to_end: Dict[str, List[float]] = {name: [] for name in names}
+
+        def run(index: int) -> None:
+            name = plan[index]
+            op_rng = random.Random(args.seed * 1_000_003 + index)
+            began = time.perf_counter()
+            getattr(operations, name)(op_rng)
+            end_to_end[name].append(time.perf_counter() - began)
+            service[name].append(operations.local.service)
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.workers) as pool:
+            list(pool.map(run, range(len(plan))))
+        run_seconds = time.perf_counter() - started
+        if kind == "sqlite":
+            store.close()
+
+    latencies = {name: percentiles(values) for name, values in service.items()}
+    return {
+        "store": kind,
+        "users": args.users,
+        "meetings": args.meetings,
+        "load": {
+            "seconds": round(load_seconds, 4),
+            "meetings_per_second": round(args.meetings / load_seconds, 1) if load_seconds else None
+        },
+        "run": {
+            "operations": len(plan),
+            "workers": args.workers,
+            "seconds": round(run_seconds, 4),
+            "throughput_ops_per_second": round(len(plan) / run_seconds, 1) if run_seconds else None
+        },
+        # Service time per call, and what a client saw including waiting for its turn
+        "latency": latencies,
+        "end_to_end_latency": {name: percentiles(values) for name, values in end_to_end.items()},
+        "slo": {
+            name: {
+                "p99_target_ms": SLO_P99_MS[name],
+                "met": stats.get("p99_ms", 0) <= SLO_P99_MS[name]
+            }
+            for name, stats in latencies.items()
+        },
+        "memory": {
+            "baseline_rss_mb": rss_before,
+            "loaded_rss_mb": rss_loaded,
+            "peak_rss_mb": max_rss_mb()
+        }
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the meeting scheduler stores and tools")
+    parser.add_argument("--stores", nargs="+", default=["memory", "sqlite"], choices=["memory", "sqlite"])
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--meetings", type=int, default=1_000_000)
+    parser.add_argument("--days", type=int, default=90, help="Span the synthetic meetings cover")
+    parser.add_argument("--operations", type=int, default=5000, help="Requests in the concurrent mix per store")
+    parser.add_argument("--workers", type=int, default=8, help="Concurrent clients")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--fail-on-slo", action="store_true", help="Exit non-zero if any p99 target is missed")
+    parser.add_argument("--output", default="load_test_results.json")
+    args = parser.parse_args()
+
+    results = []
+    for kind in args.stores:
+        print(f"Benchmarking {kind} store with {args.users} users and {args.meetings} meetings...")
+        # A fresh process per store keeps memory readings independent
+        with ProcessPoolExecutor(max_workers=1) as pool:
+            result = pool.submit(benchmark_store, kind, args).result()
+        print(json.dumps(result, indent=2))
+        results.append(result)
+
+    report = {
+        "generated_at": datetime.utcnow().isoformat(),
+        "python": platform.python_version(),
+        "config": {k: v for k, v in vars(args).items() if k != "output"},
+        "results": results
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.output}")
+
+    if args.fail_on_slo and not all(s["met"] for r in results for s in r["slo"].values()):
+        raise SystemExit("p99 latency SLO missed")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,272 @@
+import time
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import List, Dict, Optional, Set, Tuple
+from .models import Meeting, to_utc
+from .scheduling import find_free_slots, merge_intervals, SLOT_STEP_MINUTES
+from .storage import MemoryStore
+
+Interval = Tuple[datetime, datetime]
+
+# Most important meetings are placed first
+PRIORITY_ORDER = {"high": 0, "medium": 1, "normal": 1, "low": 2}
+
+# Small pull towards earlier slots, so it only breaks ties between equally fragmented ones
+EARLINESS_WEIGHT = 0.01
+
+# Improvement passes over all placements before the local search gives up
+MAX_PASSES = 5
+
+@dataclass
+class BatchRequest:
+    """One meeting to place: who, how long, and the slots where everyone is free."""
+    key: str
+    meeting: Meeting
+    priority: int = 1
+    candidates: List[datetime] = field(default_factory=list)
+
+class ParticipantTimeline:
+    """
+    One participant's busy intervals in the batch range, sorted and non-overlapping.
+    Each interval remembers which batch request placed it (None for stored meetings).
+    """
+
+    def __init__(self, busy: List[Interval]):
+        self._starts = [start for start, _ in busy]
+        self._ends = [end for _, end in busy]
+        self._owners: List[Optional[str]] = [None] * len(busy)
+
+    def blockers(self, start: datetime, end: datetime) -> Set[Optional[str]]:
+        """Owners of intervals overlapping [start, end)."""
+        index = bisect_right(self._starts, start) - 1
+        if index < 0 or self._ends[index] <= start:
+            index += 1
+        owners = set()
+        while index < len(self._starts) and self._starts[index] < end:
+            owners.add(self._owners[index])
+            index += 1
+        return owners
+
+    def is_free(self, start: datetime, end: datetime) -> bool:
+        index = bisect_right(self._starts, start)
+        if index and self._ends[index - 1] > start:
+            return False
+        return index == len(self._starts) or self._starts[index] >= end
+
+    def switch_cost(self, start: datetime, end: datetime) -> int:
+        """
+        Change in the number of separate meeting blocks if [start, end) were added:
+        +1 for an island, 0 when it extends a block, -1 when it joins two blocks.
+        """
+        index = bisect_right(self._starts, start)
+        touches_before = index > 0 and self._ends[index - 1] == start
+        touches_after = index < len(self._starts) and self._starts[index] == end
+        return 1 - touches_before - touches_after
+
+    def add(self, start: datetime, end: datetime, owner: str) -> None:
+        index = bisect_right(self._starts, start)
+        self._starts.insert(index, start)
+        self._ends.insert(index, end)
+        self._owners.insert(index, owner)
+
+    def remove(self, start: datetime, owner: str) -> None:
+        index = bisect_left(self._starts, start)
+        while self._owners[index] != owner:
+            index += 1
+        del self._starts[index]
+        del self._ends[index]
+        del self._owners[index]
+
+    def block_count(self) -> int:
+        blocks = 0
+        for index, start in enumerate(self._starts):
+            if index == 0 or self._ends[index - 1] != start:
+                blocks += 1
+        return blocks
+
+def duplicate_ids(meetings: List[Meeting]) -> List[str]:
+    """Ids used by more than one meeting, in first-seen order."""
+    seen, duplicates = set(), []
+    for meeting in meetings:
+        if meeting.id in seen and meeting.id not in duplicates:
+            duplicates.append(meeting.id)
+        seen.add(meeting.id)
+    return duplicates
+
+class BatchScheduler:
+    """
+    Places many meetings jointly. A greedy pass puts the most constrained meetings
+    first into the slot that adds the fewest context switches (separate meeting
+    blocks) for their participants; a repair pass moves one placed meeting aside to
+    make room for any left over, and an improvement pass re-places each meeting in
+    turn while that lowers the total. Placed meetings never overlap each other or
+    stored meetings, and stay inside every participant's working hours.
+    """
+
+    def __init__(
+        self,
+        store: MemoryStore,
+        start_time: datetime,
+        end_time: datetime,
+        step: int = SLOT_STEP_MINUTES,
+        time_budget: float = 2.0
+    ):
+        self.store = store
+        self.start_time = to_utc(start_time)
+        self.end_time = to_utc(end_time)
+        self.step = step
+        self.time_budget = time_budget
+        self.timelines: Dict[str, ParticipantTimeline] = {}
+        self.placements: Dict[str, datetime] = {}
+        self.requests: Dict[str, BatchRequest] = {}
+
+    def _timeline(self, participant: str) -> ParticipantTimeline:
+        if participant not in self.timelines:
+            busy = [
+                (to_utc(m.start_time), to_utc(m.start_time) + timedelta(minutes=m.duration))
+                for m in self.store.get_user_meetings_overlapping(participant, self.start_time, self.end_time)
+            ]
+            self.timelines[participant] = ParticipantTimeline(merge_intervals(busy))
+        return self.timelines[participant]
+
+    def _candidates(self, meeting: Meeting) -> List[datetime]:
+        window_start, window_end = self.start_time, self.end_time
+        # Optional per-meeting bounds, e.g. {"not_before": "...", "not_after": "..."}
+        if "not_before" in meeting.preferences:
+            window_start = max(window_start, to_utc(datetime.fromisoformat(meeting.preferences["not_before"])))
+        if "not_after" in meeting.preferences:
+            window_end = min(window_end, to_utc(datetime.fromisoformat(meeting.preferences["not_after"])))
+        if window_start >= window_end:
+            return []
+        slots = find_free_slots(
+            self.store, meeting.participants, meeting.duration, window_start, window_end, self.step
+        )
+        return [slot["start"] for slot in slots]
+
+    def _cost(self, request: BatchRequest, start: datetime) -> Optional[float]:
+        """Added context switches for placing `request` at `start`, or None if it would conflict."""
+        end = start + timedelta(minutes=request.meeting.duration)
+        switches = 0
+        for participant in request.meeting.participants:
+            timeline = self.timelines[participant]
+            if not timeline.is_free(start, end):
+                return None
+            switches += timeline.switch_cost(start, end)
+        span = max((self.end_time - self.start_time).total_seconds(), 1)
+        return switches + EARLINESS_WEIGHT * (start - self.start_time).total_seconds() / span
+
+    def _best_slot(self, request: BatchRequest) -> Optional[Tuple[float, datetime]]:
+        best = None
+        for start in request.candidates:
+            cost = self._cost(request, start)
+            if cost is not None and (best is None or cost < best[0]):
+                best = (cost, start)
+        return best
+
+    def _place(self, request: BatchRequest, start: datetime) -> None:
+        end = start + timedelta(minutes=request.meeting.duration)
+        for participant in request.meeting.participants:
+            self.timelines[participant].add(start, end, request.key)
+        self.placements[request.key] = start
+
+    def _unplace(self, request: BatchRequest) -> datetime:
+        start = self.placements.pop(request.key)
+        for participant in request.meeting.participants:
+            self.timelines[participant].remove(start, request.key)
+        return start
+
+    def _blockers(self, request: BatchRequest, start: datetime) -> Set[Optional[str]]:
+        end = start + timedelta(minutes=request.meeting.duration)
+        owners: Set[Optional[str]] = set()
+        for participant in request.meeting.participants:
+            owners |= self.timelines[participant].blockers(start, end)
+        return owners
+
+    def _repair(self, request: BatchRequest, deadline: float) -> bool:
+        """Place an unplaced request by moving a single batch meeting that is in its way."""
+        for start in request.candidates:
+            if time.perf_counter() > deadline:
+                return False
+            blockers = self._blockers(request, start)
+            if len(blockers) != 1 or None in blockers:
+                continue
+            other = self.requests[blockers.pop()]
+            previous = self._unplace(other)
+            self._place(request, start)
+            moved = self._best_slot(other)
+            if moved is not None:
+                self._place(other, moved[1])
+                return True
+            self._unplace(request)
+            self._place(other, previous)
+        return False
+
+    def _improve(self, deadline: float) -> None:
+        for _ in range(MAX_PASSES):
+            improved = False
+            for key in list(self.placements):
+                if time.perf_counter() > deadline:
+                    return
+                request = self.requests[key]
+                current = self._unplace(request)
+                current_cost = self._cost(request, current)
+                best = self._best_slot(request)
+                if best is not None and best[0] < current_cost - 1e-9:
+                    self._place(request, best[1])
+                    improved = True
+                else:
+                    self._place(request, current)
+            if not improved:
+                return
+
+    def schedule(self, meetings: List[Meeting]) -> Dict:
+        """Place `meetings` in the range; returns placements, unplaceable meetings and block counts."""
+        duplicates = duplicate_ids(meetings)
+        if duplicates:
+            raise ValueError(f"Duplicate meeting ids in batch: {', '.join(duplicates)}")
+        deadline = time.perf_counter() + self.time_budget
+        for meeting in meetings:
+            priority = PRIORITY_ORDER.get(str(meeting.preferences.get("priority", "medium")).lower(), 1)
+            self.requests[meeting.id] = BatchRequest(meeting.id, meeting, priority, self._candidates(meeting))
+            for participant in meeting.participants:
+                self._timeline(participant)
+        blocks_before = sum(t.block_count() for t in self.timelines.values())
+
+        # Most important, then most constrained, then biggest meetings first
+        order = sorted(self.requests.values(), key=lambda r: (
+            r.priority, len(r.candidates), -r.meeting.duration * len(r.meeting.participants)
+        ))
+        unplaced = []
+        for request in order:
+            best = self._best_slot(request)
+            if best is None:
+                unplaced.append(request)
+            else:
+                self._place(request, best[1])
+
+        still_unplaced = [r for r in unplaced if not r.candidates or not self._repair(r, deadline)]
+        self._improve(deadline)
+
+        placements = []
+        for meeting in meetings:
+            if meeting.id in self.placements:
+                start = self.placements[meeting.id]
+                placements.append({
+                    "meeting": meeting,
+                    "start": start,
+                    "end": start + timedelta(minutes=meeting.duration)
+                })
+        return {
+            "placements": placements,
+            "unplaceable": [
+                {
+                    "meeting": r.meeting,
+                    "reason": "No common free slot in the range" if not r.candidates
+                    else "Every free slot is taken by other meetings in the batch"
+                }
+                for r in still_unplaced
+            ],
+            "meeting_blocks_before": blocks_before,
+            "meeting_blocks_after": sum(t.block_count() for t in self.timelines.values())
+        }
\ No newline at end of file
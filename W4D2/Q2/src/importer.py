@@ -0,0 +1,146 @@
+import re
+import uuid
+from datetime import datetime, timedelta
+from typing import List, Dict, Tuple, Iterable
+import pytz
+from .models import Meeting, to_utc, get_timezone
+from .recurrence import meeting_intervals
+from .storage import MemoryStore
+
+Interval = Tuple[datetime, datetime]
+
+DURATION_PATTERN = re.compile(
+    r"^([+-])?P(?:(\d+)W)?(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?)?$"
+)
+
+def parse_json_meetings(items: Iterable[Dict]) -> List[Meeting]:
+    """Build meetings from create_meeting-style dicts; ids are generated when missing."""
+    meetings = []
+    for item in items:
+        meetings.append(Meeting(
+            id=item.get("id") or str(uuid.uuid4()),
+            title=item["title"],
+            participants=item["participants"],
+            start_time=datetime.fromisoformat(item["start_time"]),
+            duration=item["duration"],
+            preferences=item.get("preferences", {}),
+            agenda=item.get("agenda", []),
+            recurrence=item.get("recurrence")
+        ))
+    return meetings
+
+def _unfold(text: str) -> List[str]:
+    """Join iCalendar continuation lines (those starting with a space or tab)."""
+    lines: List[str] = []
+    for raw in text.splitlines():
+        if raw[:1] in (" ", "\t") and lines:
+            lines[-1] += raw[1:]
+        elif raw:
+            lines.append(raw)
+    return lines
+
+def _split_property(line: str) -> Tuple[str, Dict[str, str], str]:
+    head, _, value = line.partition(":")
+    name, *params = head.split(";")
+    return name.upper(), dict(p.split("=", 1) for p in params if "=" in p), value
+
+def _parse_ical_datetime(value: str, params: Dict[str, str]) -> datetime:
+    if value.endswith("Z"):
+        return pytz.UTC.localize(datetime.strptime(value[:-1], "%Y%m%dT%H%M%S"))
+    if params.get("VALUE") == "DATE" or len(value) == 8:
+        moment = datetime.strptime(value, "%Y%m%d")
+    else:
+        moment = datetime.strptime(value, "%Y%m%dT%H%M%S")
+    if "TZID" in params:
+        return get_timezone(params["TZID"]).localize(moment)
+    return moment
+
+def _parse_ical_duration(value: str) -> int:
+    match = DURATION_PATTERN.match(value)
+    if not match:
+        raise ValueError(f"Unsupported DURATION: {value}")
+    weeks, days, hours, minutes, seconds = (int(g or 0) for g in match.groups()[1:])
+    return int(timedelta(weeks=weeks, days=days, hours=hours, minutes=minutes, seconds=seconds).total_seconds() // 60)
+
+def parse_ical_meetings(text: str) -> List[Meeting]:
+    """
+    Build meetings from the VEVENTs of an iCalendar document. Attendees become
+    participants (the part after "mailto:"), and an RRULE makes the meeting recurring.
+    """
+    meetings = []
+    event = None
+    for line in _unfold(text):
+        name, params, value = _split_property(line)
+        if name == "BEGIN" and value.upper() == "VEVENT":
+            event = {"participants": []}
+        elif name == "END" and value.upper() == "VEVENT" and event is not None:
+            start = event["start"]
+            if "end" in event:
+                duration = int((to_utc(event["end"]) - to_utc(start)).total_seconds() // 60)
+            else:
+                duration = event.get("duration", 0)
+            meetings.append(Meeting(
+                id=event.get("uid") or str(uuid.uuid4()),
+                title=event.get("title", ""),
+                participants=event["participants"],
+                start_time=start,
+                duration=duration,
+                recurrence=event.get("rrule")
+            ))
+            event = None
+        elif event is None:
+            continue
+        elif name == "UID":
+            event["uid"] = value
+        elif name == "SUMMARY":
+            event["title"] = value
+        elif name == "DTSTART":
+            event["start"] = _parse_ical_datetime(value, params)
+        elif name == "DTEND":
+            event["end"] = _parse_ical_datetime(value, params)
+        elif name == "DURATION":
+            event["duration"] = _parse_ical_duration(value)
+        elif name == "RRULE":
+            event["rrule"] = value
+        elif name in ("ATTENDEE", "ORGANIZER"):
+            participant = value[7:] if value.lower().startswith("mailto:") else value
+            if participant not in event["participants"]:
+                event["participants"].append(participant)
+    return meetings
+
+def find_import_conflicts(store: MemoryStore, meetings: List[Meeting]) -> Dict[str, List[Dict]]:
+    """
+    Check a whole batch for conflicts in one pass. Each participant's intervals from
+    the batch are sorted and swept against each other, and each interval is checked
+    against already stored meetings through the calendar index. Recurring meetings
+    are expanded over the recurrence horizon. Returns conflicts keyed by meeting id.
+    """
+    per_participant: Dict[str, List[Tuple[datetime, datetime, Meeting]]] = {}
+    for meeting in meetings:
+        for start, end in meeting_intervals(meeting):
+            for participant in meeting.participants:
+                per_participant.setdefault(participant, []).append((start, end, meeting))
+
+    conflicts: Dict[str, List[Dict]] = {}
+
+    def record(meeting: Meeting, participant: str, other: Meeting, moment: datetime) -> None:
+        conflicts.setdefault(meeting.id, []).append({
+            "participant": participant,
+            "conflicting_meeting": other.title,
+            "meeting_time": moment.isoformat()
+        })
+
+    for participant, intervals in per_participant.items():
+        intervals.sort(key=lambda item: (item[0], item[1]))
+        # Sweep: keep the batch interval that reaches furthest so far
+        latest_end, latest_meeting = None, None
+        for start, end, meeting in intervals:
+            if latest_end is not None and start < latest_end and latest_meeting.id != meeting.id:
+                record(meeting, participant, latest_meeting, start)
+                record(latest_meeting, participant, meeting, start)
+            if latest_end is None or end > latest_end:
+                latest_end, latest_meeting = end, meeting
+            for existing in store.get_user_meetings_overlapping(participant, start, end):
+                if existing.id != meeting.id and existing.series_id != meeting.id:
+                    record(meeting, participant, existing, existing.start_time)
+    return conflicts
\ No newline at end of file
@@ -1,6 +1,19 @@
 from dataclasses import dataclass, field
 from datetime import datetime
+from functools import lru_cache
 from typing import List, Dict, Optional
+import pytz
+
+def to_utc(value: datetime) -> datetime:
+    """Normalize a datetime to aware UTC; naive values are taken to already be UTC."""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=pytz.UTC)
+    return value.astimezone(pytz.UTC)
+
+@lru_cache(maxsize=None)
+def get_timezone(name: str):
+    """pytz zone by name, looked up once per process."""
+    return pytz.timezone(name)
 
 @dataclass
 class Meeting:
@@ -13,6 +26,10 @@ class Meeting:
     agenda: List[str] = field(default_factory=list)
     effectiveness_score: float = 0.0
     status: str = "scheduled"
+    # RRULE-style recurrence (e.g. "FREQ=WEEKLY;BYDAY=MO,WE;COUNT=10"); None for one-off meetings
+    recurrence: Optional[str] = None
+    # Set on expanded occurrences to the id of the recurring meeting they came from
+    series_id: Optional[str] = None
 
     def to_dict(self) -> Dict:
         return {
@@ -24,7 +41,9 @@ class Meeting:
             "preferences": self.preferences,
             "agenda": self.agenda,
             "effectiveness_score": self.effectiveness_score,
-            "status": self.status
+            "status": self.status,
+            "recurrence": self.recurrence,
+            "series_id": self.series_id
         }
 
     @classmethod
@@ -0,0 +1,214 @@
+import json
+import os
+import pickle
+import sqlite3
+from contextlib import contextmanager
+from queue import Queue
+from typing import List, Optional, Tuple
+from .models import Meeting, User, to_utc
+from .storage import MemoryStore
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meetings (
+    id TEXT PRIMARY KEY,
+    start_time TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meeting_participants (
+    meeting_id TEXT NOT NULL REFERENCES meetings(id) ON DELETE CASCADE,
+    participant TEXT NOT NULL,
+    start_time TEXT NOT NULL,
+    PRIMARY KEY (meeting_id, participant)
+);
+CREATE INDEX IF NOT EXISTS idx_participant_start
+    ON meeting_participants (participant, start_time);
+CREATE TABLE IF NOT EXISTS users (
+    id TEXT PRIMARY KEY,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+# Bump whenever the pickled index classes (UserCalendar, DayTotals, ...) change shape,
+# so snapshots from an older build are ignored instead of loaded
+SNAPSHOT_VERSION = 2
+
+class ConnectionPool:
+    """A fixed set of SQLite connections handed out one caller at a time."""
+
+    def __init__(self, db_path: str, size: int = 4):
+        self._connections: Queue = Queue(maxsize=size)
+        for _ in range(size):
+            conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            self._connections.put(conn)
+
+    @contextmanager
+    def connection(self):
+        conn = self._connections.get()
+        try:
+            yield conn
+        finally:
+            self._connections.put(conn)
+
+    def close(self) -> None:
+        while not self._connections.empty():
+            self._connections.get().close()
+
+class SQLiteStore(MemoryStore):
+    """
+    MemoryStore persisted to SQLite. Reads are served from the in-memory indexes;
+    every change is written through to the database, in one transaction per call or
+    per `batch()` block. A pickled snapshot of the indexes, tagged with the database
+    write generation, lets startup skip the rebuild when nothing changed since.
+    """
+
+    def __init__(self, db_path: str, snapshot_path: Optional[str] = None, pool_size: int = 4):
+        super().__init__()
+        self.db_path = db_path
+        self.snapshot_path = snapshot_path or db_path + ".snapshot"
+        self.pool = ConnectionPool(db_path, pool_size)
+        self._pending: List[Tuple[str, tuple]] = []
+        self._batch_depth = 0
+        self.generation = 0
+
+        with self.pool.connection() as conn:
+            conn.executescript(SCHEMA)
+            row = conn.execute("SELECT value FROM meta WHERE key = 'generation'").fetchone()
+            self.generation = int(row[0]) if row else 0
+
+        if not self._load_snapshot():
+            self._rebuild_from_db()
+
+    # Startup
+
+    def _load_snapshot(self) -> bool:
+        if not os.path.exists(self.snapshot_path):
+            return False
+        try:
+            with open(self.snapshot_path, "rb") as f:
+                snapshot = pickle.load(f)
+        except Exception:
+            # Unreadable, or refers to classes this build no longer has
+            return False
+        if not isinstance(snapshot, dict) or snapshot.get("version") != SNAPSHOT_VERSION:
+            return False
+        # Any write after the snapshot bumps the generation, so a mismatch means it is stale
+        if snapshot.get("generation") != self.generation:
+            return False
+        self.meetings = snapshot["meetings"]
+        self.users = snapshot["users"]
+        self.user_calendars = snapshot["user_calendars"]
+        return True
+
+    def _rebuild_from_db(self) -> None:
+        with self.pool.connection() as conn:
+            for (data,) in conn.execute("SELECT data FROM users"):
+                MemoryStore.add_user(self, User.from_dict(json.loads(data)))
+            # Start order keeps calendar inserts at the tail of each sorted list
+            for (data,) in conn.execute("SELECT data FROM meetings ORDER BY start_time"):
+                MemoryStore.add_meeting(self, Meeting.from_dict(json.loads(data)))
+
+    def save_snapshot(self) -> None:
+        """Flush pending writes and atomically write a snapshot of the in-memory indexes."""
+        self.flush()
+        tmp_path = self.snapshot_path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump({
+                "version": SNAPSHOT_VERSION,
+                "generation": self.generation,
+                "meetings": self.meetings,
+                "users": self.users,
+                "user_calendars": self.user_calendars
+            }, f, protocol=pickle.HIGHEST_PROTOCOL)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.snapshot_path)
+
+    def close(self) -> None:
+        self.save_snapshot()
+        self.pool.close()
+
+    # Writes
+
+    @contextmanager
+    def batch(self):
+        """Group every change made inside the block into a single transaction."""
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self.flush()
+
+    def _queue(self, sql: str, params: tuple) -> None:
+        self._pending.append((sql, params))
+        if self._batch_depth == 0:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write queued changes in one transaction and bump the write generation."""
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, []
+        with self.pool.connection() as conn:
+            conn.execute("BEGIN")
+            try:
+                for sql, params in pending:
+                    conn.execute(sql, params)
+                conn.execute(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES ('generation', ?)",
+                    (str(self.generation + 1),)
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        self.generation += 1
+
+    def _queue_meeting_upsert(self, meeting: Meeting) -> None:
+        start = to_utc(meeting.start_time).isoformat()
+        self._queue(
+            "INSERT OR REPLACE INTO meetings (id, start_time, data) VALUES (?, ?, ?)",
+            (meeting.id, start, json.dumps(meeting.to_dict()))
+        )
+        self._queue("DELETE FROM meeting_participants WHERE meeting_id = ?", (meeting.id,))
+        for participant in meeting.participants:
+            self._queue(
+                "INSERT INTO meeting_participants (meeting_id, participant, start_time) VALUES (?, ?, ?)",
+                (meeting.id, participant, start)
+            )
+
+    def add_meeting(self, meeting: Meeting) -> None:
+        # update_meeting re-adds through here, so updates are persisted too
+        super().add_meeting(meeting)
+        with self.batch():
+            self._queue_meeting_upsert(meeting)
+
+    def delete_meeting(self, meeting_id: str) -> None:
+        existed = meeting_id in self.meetings
+        super().delete_meeting(meeting_id)
+        if existed:
+            self._queue("DELETE FROM meetings WHERE id = ?", (meeting_id,))
+
+    def add_user(self, user: User) -> None:
+        super().add_user(user)
+        self._queue(
+            "INSERT OR REPLACE INTO users (id, data) VALUES (?, ?)",
+            (user.id, json.dumps(user.to_dict()))
+        )
+
+def create_store() -> MemoryStore:
+    """Build the storage backend selected by MEETING_STORE ('memory' or 'sqlite')."""
+    backend = os.getenv("MEETING_STORE", "memory")
+    if backend == "sqlite":
+        return SQLiteStore(os.getenv("MEETING_DB_PATH", "meetings.db"))
+    if backend != "memory":
+        raise ValueError(f"Unknown MEETING_STORE backend: {backend}")
+    return MemoryStore()
\ No newline at end of file
@@ -0,0 +1,60 @@
+from dataclasses import replace
+from datetime import datetime, timedelta
+from typing import List, Tuple
+from zoneinfo import ZoneInfo
+from dateutil.rrule import rrulestr
+import pytz
+from .models import Meeting, to_utc
+
+Interval = Tuple[datetime, datetime]
+
+# How far ahead an open-ended series is checked for conflicts when it is created
+RECURRENCE_HORIZON_DAYS = 90
+
+def _rule_start(meeting: Meeting) -> datetime:
+    """The series start in its own zone, so occurrences keep their local hour across DST."""
+    start = meeting.start_time
+    if start.tzinfo is None:
+        return to_utc(start)
+    zone = getattr(start.tzinfo, "zone", None)
+    if zone:
+        # pytz offsets are fixed per datetime; zoneinfo lets the rule step on wall-clock time
+        return start.replace(tzinfo=None).replace(tzinfo=ZoneInfo(zone))
+    return start
+
+def occurrence_starts(meeting: Meeting, start_time: datetime, end_time: datetime) -> List[datetime]:
+    """
+    UTC start times of a recurring meeting's occurrences that overlap [start_time, end_time).
+    UNTIL values in the rule must be given in UTC ("...Z").
+    """
+    rule = rrulestr(meeting.recurrence, dtstart=_rule_start(meeting))
+    start_time, end_time = to_utc(start_time), to_utc(end_time)
+    length = timedelta(minutes=meeting.duration)
+    # An occurrence that starts up to one meeting length early still overlaps the window
+    starts = (s.astimezone(pytz.UTC) for s in rule.between(start_time - length, end_time, inc=True))
+    return [s for s in starts if s + length > start_time and s < end_time]
+
+def expand(meeting: Meeting, start_time: datetime, end_time: datetime) -> List[Meeting]:
+    """Materialize only the occurrences of a recurring meeting that overlap the window."""
+    tz = meeting.start_time.tzinfo
+    occurrences = []
+    for start in occurrence_starts(meeting, start_time, end_time):
+        # Present each occurrence the way the series start was given
+        start = start.astimezone(tz) if tz is not None else start.replace(tzinfo=None)
+        occurrences.append(replace(
+            meeting,
+            id=f"{meeting.id}@{start.isoformat()}",
+            start_time=start,
+            recurrence=None,
+            series_id=meeting.id
+        ))
+    return occurrences
+
+def meeting_intervals(meeting: Meeting, horizon_days: int = RECURRENCE_HORIZON_DAYS) -> List[Interval]:
+    """UTC intervals a meeting occupies; a series is cut off `horizon_days` after it starts."""
+    start = to_utc(meeting.start_time)
+    length = timedelta(minutes=meeting.duration)
+    if not meeting.recurrence:
+        return [(start, start + length)]
+    horizon = start + timedelta(days=horizon_days)
+    return [(s, s + length) for s in occurrence_starts(meeting, start, horizon)]
\ No newline at end of file
@@ -0,0 +1,188 @@
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, timedelta, time
+from functools import lru_cache
+from typing import List, Dict, Tuple, Iterable
+import pytz
+from .models import User, get_timezone, to_utc
+from .storage import MemoryStore
+
+Interval = Tuple[datetime, datetime]
+
+# Slots start on this grid within each free window
+SLOT_STEP_MINUTES = 30
+
+# Gap to neighbouring meetings beyond which a slot gets no extra buffer credit
+MAX_BUFFER_MINUTES = 60
+
+def merge_intervals(intervals: Iterable[Interval]) -> List[Interval]:
+    """Sweep sorted intervals once, merging any that overlap or touch."""
+    merged: List[Interval] = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+def intersect_intervals(a: List[Interval], b: List[Interval]) -> List[Interval]:
+    """Intersect two sorted, non-overlapping interval lists with a two-pointer sweep."""
+    result: List[Interval] = []
+    i = j = 0
+    while i < len(a) and j < len(b):
+        start = max(a[i][0], b[j][0])
+        end = min(a[i][1], b[j][1])
+        if start < end:
+            result.append((start, end))
+        if a[i][1] < b[j][1]:
+            i += 1
+        else:
+            j += 1
+    return result
+
+def subtract_intervals(available: List[Interval], busy: List[Interval]) -> List[Interval]:
+    """Remove sorted, merged busy intervals from sorted available intervals."""
+    result: List[Interval] = []
+    j = 0
+    for start, end in available:
+        while j < len(busy) and busy[j][1] <= start:
+            j += 1
+        k = j
+        cursor = start
+        while k < len(busy) and busy[k][0] < end:
+            if busy[k][0] > cursor:
+                result.append((cursor, busy[k][0]))
+            cursor = max(cursor, busy[k][1])
+            k += 1
+        if cursor < end:
+            result.append((cursor, end))
+    return result
+
+@lru_cache(maxsize=256)
+def _parse_hm(value: str) -> time:
+    hours, minutes = value.split(":")
+    return time(int(hours), int(minutes))
+
+@lru_cache(maxsize=1 << 16)
+def _local_day_window(zone: str, day: date, day_start: time, day_end: time) -> Interval:
+    """UTC bounds of one local working day; the same days recur across queries, so they are cached."""
+    tz = get_timezone(zone)
+    # normalize() moves a start inside a spring-forward gap to the next real wall time
+    local_start = tz.normalize(tz.localize(datetime.combine(day, day_start)))
+    # An end at or before the start means the shift runs past midnight
+    end_day = day + timedelta(days=1) if day_end <= day_start else day
+    local_end = tz.normalize(tz.localize(datetime.combine(end_day, day_end)))
+    return local_start.astimezone(pytz.UTC), local_end.astimezone(pytz.UTC)
+
+@lru_cache(maxsize=1024)
+def _working_windows(
+    zone: str,
+    hours_start: str,
+    hours_end: str,
+    start_time: datetime,
+    end_time: datetime
+) -> Tuple[Interval, ...]:
+    tz = get_timezone(zone)
+    day_start, day_end = _parse_hm(hours_start), _parse_hm(hours_end)
+
+    windows: List[Interval] = []
+    day = start_time.astimezone(tz).date() - timedelta(days=1)
+    last_day = end_time.astimezone(tz).date()
+    while day <= last_day:
+        local_start, local_end = _local_day_window(zone, day, day_start, day_end)
+        window_start = max(local_start, start_time)
+        window_end = min(local_end, end_time)
+        if window_start < window_end:
+            windows.append((window_start, window_end))
+        day += timedelta(days=1)
+    return tuple(merge_intervals(windows))
+
+def working_windows(user: User, start_time: datetime, end_time: datetime) -> List[Interval]:
+    """
+    A user's working hours in UTC for every local day touching [start_time, end_time).
+    Results are cached per timezone, working hours and range, so users who share
+    them, and repeated queries over the same range, reuse one computation.
+    """
+    return list(_working_windows(
+        user.timezone,
+        user.working_hours.get("start", "09:00"),
+        user.working_hours.get("end", "17:00"),
+        to_utc(start_time),
+        to_utc(end_time)
+    ))
+
+def common_free_windows(
+    store: MemoryStore,
+    participants: List[str],
+    start_time: datetime,
+    end_time: datetime
+) -> Tuple[List[Interval], List[Interval]]:
+    """Windows where every participant is working and free, plus everyone's merged busy time."""
+    start_time, end_time = to_utc(start_time), to_utc(end_time)
+
+    available = [(start_time, end_time)]
+    busy: List[Interval] = []
+    profiles = set()
+    for participant in participants:
+        user = store.get_user(participant) or User(id=participant)
+        profile = (user.timezone, user.working_hours.get("start", "09:00"), user.working_hours.get("end", "17:00"))
+        # Participants with the same timezone and hours share one set of windows
+        if profile not in profiles:
+            profiles.add(profile)
+            available = intersect_intervals(available, working_windows(user, start_time, end_time))
+        for meeting in store.get_user_meetings_overlapping(participant, start_time, end_time):
+            meeting_start = to_utc(meeting.start_time)
+            busy.append((meeting_start, meeting_start + timedelta(minutes=meeting.duration)))
+
+    busy = merge_intervals(busy)
+    return subtract_intervals(available, busy), busy
+
+def find_free_slots(
+    store: MemoryStore,
+    participants: List[str],
+    duration: int,
+    start_time: datetime,
+    end_time: datetime,
+    step: int = SLOT_STEP_MINUTES
+) -> List[Dict]:
+    """
+    Find every slot of `duration` minutes, on a `step`-minute grid, when all
+    participants are within working hours and free. Each slot is scored on buffer
+    to neighbouring meetings, how early it is, and whether it keeps free time in
+    one block; results are in chronological order.
+    """
+    range_start, range_end = to_utc(start_time), to_utc(end_time)
+    free, busy = common_free_windows(store, participants, range_start, range_end)
+    length = timedelta(minutes=duration)
+    grid = timedelta(minutes=step)
+    total_span = max((range_end - range_start).total_seconds(), 1)
+
+    slots = []
+    for window_start, window_end in free:
+        # First grid point at or after the window start
+        offset = (window_start - range_start) % grid
+        slot_start = window_start + (grid - offset if offset else timedelta(0))
+        while slot_start + length <= window_end:
+            slot_end = slot_start + length
+            before = _gap_before(busy, slot_start)
+            after = _gap_after(busy, slot_end)
+            buffer_score = min(before, after, MAX_BUFFER_MINUTES) / MAX_BUFFER_MINUTES
+            earliness = 1 - (slot_start - range_start).total_seconds() / total_span
+            keeps_block = slot_start == window_start or slot_end == window_end
+            slots.append({
+                "start": slot_start,
+                "end": slot_end,
+                "score": round(0.5 * buffer_score + 0.3 * earliness + (0.2 if keeps_block else 0.0), 4)
+            })
+            slot_start += grid
+    return slots
+
+def _gap_before(busy: List[Interval], moment: datetime) -> float:
+    """Minutes since the last busy interval ended (unbounded if none)."""
+    index = bisect_right(busy, (moment, moment)) - 1
+    return (moment - busy[index][1]).total_seconds() / 60 if index >= 0 else float("inf")
+
+def _gap_after(busy: List[Interval], moment: datetime) -> float:
+    """Minutes until the next busy interval starts (unbounded if none)."""
+    index = bisect_left(busy, (moment, moment))
+    return (busy[index][0] - moment).total_seconds() / 60 if index < len(busy) else float("inf")
\ No newline at end of file
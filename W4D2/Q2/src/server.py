@@ -1,13 +1,20 @@
 from fastmcp import FastMCP, Request, Response
+import atexit
 from datetime import datetime, timedelta
 import uuid
 from typing import List, Dict
 import pytz
 from .models import Meeting, User
-from .storage import MemoryStore
+from .persistence import create_store
+from .scheduling import find_free_slots
+from .recurrence import meeting_intervals
+from .importer import parse_json_meetings, parse_ical_meetings, find_import_conflicts
+from .batch_scheduler import BatchScheduler, duplicate_ids
 
 app = FastMCP()
-store = MemoryStore()
+store = create_store()
+# Persistent stores flush and write their startup snapshot on the way out
+atexit.register(store.close)
 
 @app.mcp("/create_meeting")
 async def create_meeting(request: Request) -> Response:
@@ -22,15 +29,18 @@ async def create_meeting(request: Request) -> Response:
         start_time=datetime.fromisoformat(data["start_time"]),
         duration=data["duration"],
         preferences=data.get("preferences", {}),
-        agenda=data.get("agenda", [])
+        agenda=data.get("agenda", []),
+        recurrence=data.get("recurrence")
     )
     
-    # Check for conflicts
-    conflicts = detect_scheduling_conflicts(
-        meeting.participants,
-        meeting.start_time,
-        meeting.duration
-    )
+    # Check for conflicts, across every occurrence up to the horizon for a series
+    conflicts = []
+    for start, _ in meeting_intervals(meeting):
+        conflicts.extend(detect_scheduling_conflicts(
+            meeting.participants,
+            start,
+            meeting.duration
+        ))
     
     if conflicts:
         return Response({
@@ -46,6 +56,46 @@ async def create_meeting(request: Request) -> Response:
         "meeting": meeting.to_dict()
     })
 
+@app.mcp("/import_meetings")
+async def import_meetings(request: Request) -> Response:
+    """Import many meetings at once from JSON or iCalendar, checking conflicts in one pass."""
+    data = request.json
+    import_format = data.get("format", "json")
+    skip_conflicts = data.get("skip_conflicts", True)
+    
+    if import_format == "ical":
+        meetings = parse_ical_meetings(data["calendar"])
+    elif import_format == "json":
+        meetings = parse_json_meetings(data["meetings"])
+    else:
+        return Response({
+            "status": "error",
+            "message": f"Unsupported import format: {import_format}"
+        })
+    
+    conflicts = find_import_conflicts(store, meetings)
+    if conflicts and not skip_conflicts:
+        return Response({
+            "status": "error",
+            "message": "Scheduling conflicts detected",
+            "conflicts": conflicts
+        })
+    
+    imported = [m for m in meetings if m.id not in conflicts]
+    with store.batch():
+        for meeting in imported:
+            # Re-importing the same id (e.g. an iCalendar UID) replaces the earlier copy
+            if store.get_meeting(meeting.id):
+                store.update_meeting(meeting)
+            else:
+                store.add_meeting(meeting)
+    
+    return Response({
+        "status": "success",
+        "imported": [m.id for m in imported],
+        "skipped": conflicts
+    })
+
 @app.mcp("/find_optimal_slots")
 async def find_optimal_slots(request: Request) -> Response:
     """Find optimal meeting time slots based on participant availability."""
@@ -54,20 +104,85 @@ async def find_optimal_slots(request: Request) -> Response:
     duration = data["duration"]
     start_time = datetime.fromisoformat(data["date_range"]["start"])
     end_time = datetime.fromisoformat(data["date_range"]["end"])
+    limit = data.get("limit", 10)
     
-    available_slots = []
-    current = start_time
+    # Merge everyone's busy time once and walk the free windows inside working hours
+    slots = find_free_slots(store, participants, duration, start_time, end_time)
+    ranked = sorted(slots, key=lambda s: (-s["score"], s["start"]))[:limit]
     
-    while current < end_time:
-        if current.hour >= 9 and current.hour < 17:  # Business hours
-            if not detect_scheduling_conflicts(participants, current, duration):
-                available_slots.append(current)
-        current += timedelta(minutes=30)  # 30-minute intervals
+    def present(moment: datetime) -> str:
+        return in_caller_zone(moment, start_time).isoformat()
     
     return Response({
-        "available_slots": [slot.isoformat() for slot in available_slots]
+        "available_slots": [present(slot["start"]) for slot in slots],
+        "ranked_slots": [
+            {"start": present(slot["start"]), "end": present(slot["end"]), "score": slot["score"]}
+            for slot in ranked
+        ]
     })
 
+@app.mcp("/schedule_meetings_batch")
+async def schedule_meetings_batch(request: Request) -> Response:
+    """Place a whole batch of meetings jointly, avoiding conflicts and fragmented calendars."""
+    data = request.json
+    start_time = datetime.fromisoformat(data["date_range"]["start"])
+    end_time = datetime.fromisoformat(data["date_range"]["end"])
+    meetings = []
+    for item in data["meetings"]:
+        meetings.append(Meeting(
+            id=item.get("id") or str(uuid.uuid4()),
+            title=item["title"],
+            participants=item["participants"],
+            start_time=start_time,
+            duration=item["duration"],
+            preferences=item.get("preferences", {}),
+            agenda=item.get("agenda", [])
+        ))
+    
+    duplicates = duplicate_ids(meetings)
+    if duplicates:
+        return Response({
+            "status": "error",
+            "message": "Duplicate meeting ids in batch",
+            "duplicate_ids": duplicates
+        })
+    
+    scheduler = BatchScheduler(store, start_time, end_time, step=data.get("step", 30))
+    result = scheduler.schedule(meetings)
+    
+    # Optionally book the placements straight away
+    if data.get("commit", False):
+        with store.batch():
+            for placement in result["placements"]:
+                placement["meeting"].start_time = in_caller_zone(placement["start"], start_time)
+                store.add_meeting(placement["meeting"])
+    
+    return Response({
+        "placements": [
+            {
+                "meeting_id": p["meeting"].id,
+                "title": p["meeting"].title,
+                "participants": p["meeting"].participants,
+                "start": in_caller_zone(p["start"], start_time).isoformat(),
+                "end": in_caller_zone(p["end"], start_time).isoformat()
+            }
+            for p in result["placements"]
+        ],
+        "unplaceable": [
+            {"meeting_id": u["meeting"].id, "title": u["meeting"].title, "reason": u["reason"]}
+            for u in result["unplaceable"]
+        ],
+        "meeting_blocks_before": result["meeting_blocks_before"],
+        "meeting_blocks_after": result["meeting_blocks_after"],
+        "committed": data.get("commit", False)
+    })
+
+def in_caller_zone(moment: datetime, like: datetime) -> datetime:
+    """Express a UTC moment in the caller's timezone, or as naive UTC if they sent naive times."""
+    if like.tzinfo is None:
+        return moment.replace(tzinfo=None)
+    return moment.astimezone(like.tzinfo)
+
 def detect_scheduling_conflicts(
     participants: List[str],
     start_time: datetime,
@@ -75,20 +190,16 @@ def detect_scheduling_conflicts(
 ) -> List[Dict]:
     """Detect scheduling conflicts for participants."""
     conflicts = []
-    meeting_end = start_time + timedelta(minutes=duration)
+    end_time = start_time + timedelta(minutes=duration)
     
     for participant in participants:
-        user_meetings = store.get_user_meetings(participant)
-        for meeting in user_meetings:
-            meeting_start = meeting.start_time
-            meeting_end = meeting_start + timedelta(minutes=meeting.duration)
-            
-            if (start_time < meeting_end and meeting_start < meeting_end):
-                conflicts.append({
-                    "participant": participant,
-                    "conflicting_meeting": meeting.title,
-                    "meeting_time": meeting_start.isoformat()
-                })
+        # Only meetings overlapping the requested window, found via the calendar index
+        for meeting in store.get_user_meetings_overlapping(participant, start_time, end_time):
+            conflicts.append({
+                "participant": participant,
+                "conflicting_meeting": meeting.title,
+                "meeting_time": meeting.start_time.isoformat()
+            })
     
     return conflicts
 
@@ -102,23 +213,19 @@ async def analyze_meeting_patterns(request: Request) -> Response:
     end_time = datetime.now(pytz.UTC)
     start_time = end_time - timedelta(days=period_days)
     
-    meetings = store.get_user_meetings_in_range(user_id, start_time, end_time)
+    # Per-day totals kept by the store, so this costs O(days) rather than O(meetings)
+    summary = store.get_user_meeting_summary(user_id, start_time, end_time)
     
-    if not meetings:
+    if not summary["count"]:
         return Response({
             "message": "No meetings found in the specified period"
         })
     
-    total_meetings = len(meetings)
-    total_duration = sum(m.duration for m in meetings)
-    avg_duration = total_duration / total_meetings
+    total_meetings = summary["count"]
+    avg_duration = summary["total_minutes"] / total_meetings
     
     # Analyze meeting distribution
-    meeting_hours = {}
-    for meeting in meetings:
-        hour = meeting.start_time.hour
-        meeting_hours[hour] = meeting_hours.get(hour, 0) + 1
-    
+    meeting_hours = summary["hour_distribution"]
     peak_hour = max(meeting_hours.items(), key=lambda x: x[1])[0]
     
     return Response({
@@ -172,12 +279,12 @@ async def calculate_workload_balance(request: Request) -> Response:
     
     workload = {}
     for member in team_members:
-        meetings = store.get_user_meetings_in_range(member, start_time, end_time)
-        total_hours = sum(m.duration for m in meetings) / 60
+        summary = store.get_user_meeting_summary(member, start_time, end_time)
+        count = summary["count"]
         workload[member] = {
-            "total_hours": total_hours,
-            "meetings_count": len(meetings),
-            "average_meeting_duration": total_hours * 60 / len(meetings) if meetings else 0
+            "total_hours": summary["total_minutes"] / 60,
+            "meetings_count": count,
+            "average_meeting_duration": summary["total_minutes"] / count if count else 0
         }
     
     # Calculate team averages
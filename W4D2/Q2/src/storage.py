@@ -1,67 +1,272 @@
-from typing import List, Dict, Optional
-from datetime import datetime, timedelta
-from .models import Meeting, User
+from bisect import bisect_left, bisect_right
+from contextlib import contextmanager
+from typing import List, Dict, Optional, Tuple
+from datetime import date, datetime, time, timedelta
+import pytz
+from .models import Meeting, User, to_utc
+from .recurrence import expand
+
+class DayTotals:
+    """Meeting count, minutes and start-hour histogram for one user on one UTC day."""
+
+    __slots__ = ("count", "minutes", "hours")
+
+    def __init__(self):
+        self.count = 0
+        self.minutes = 0
+        self.hours = [0] * 24
+
+class UserCalendar:
+    """
+    A user's meetings kept sorted by start time for O(log n + k) range queries.
+    Recurring meetings are kept aside as a single entry and expanded only over the
+    window being queried. One-off meetings are also rolled up into per-day totals,
+    so summaries over long periods cost O(days) rather than O(meetings).
+    """
+
+    def __init__(self):
+        self._starts: List[datetime] = []
+        self._meetings: List[Meeting] = []
+        # UTC start each meeting was filed under, so it can be found even if mutated since
+        self._filed_at: Dict[str, datetime] = {}
+        # Longest meeting seen; bounds how early an overlapping meeting can start
+        self._max_duration = 0
+        self._recurring: Dict[str, Meeting] = {}
+        self._days: Dict[date, DayTotals] = {}
+        # Start hour and duration each meeting was counted with, to undo it on removal
+        self._counted: Dict[str, Tuple[int, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._meetings) + len(self._recurring)
+
+    def __iter__(self):
+        if not self._recurring:
+            return iter(self._meetings)
+        everything = self._meetings + list(self._recurring.values())
+        return iter(sorted(everything, key=lambda m: to_utc(m.start_time)))
+
+    def add(self, meeting: Meeting) -> None:
+        if meeting.recurrence:
+            self._recurring[meeting.id] = meeting
+            return
+        start = to_utc(meeting.start_time)
+        index = bisect_right(self._starts, start)
+        self._starts.insert(index, start)
+        self._meetings.insert(index, meeting)
+        self._filed_at[meeting.id] = start
+        self._max_duration = max(self._max_duration, meeting.duration)
+        self._counted[meeting.id] = (meeting.start_time.hour, meeting.duration)
+        self._tally(start.date(), meeting.start_time.hour, meeting.duration, 1)
+
+    def _tally(self, day: date, hour: int, duration: int, sign: int) -> None:
+        totals = self._days.get(day)
+        if totals is None:
+            totals = self._days[day] = DayTotals()
+        totals.count += sign
+        totals.minutes += sign * duration
+        totals.hours[hour] += sign
+        if not totals.count:
+            del self._days[day]
+
+    def remove(self, meeting_id: str) -> bool:
+        if self._recurring.pop(meeting_id, None) is not None:
+            return True
+        start = self._filed_at.pop(meeting_id, None)
+        if start is None:
+            return False
+        index = bisect_left(self._starts, start)
+        while self._meetings[index].id != meeting_id:
+            index += 1
+        del self._starts[index]
+        del self._meetings[index]
+        hour, duration = self._counted.pop(meeting_id)
+        self._tally(start.date(), hour, duration, -1)
+        return True
+
+    def overlapping(self, start_time: datetime, end_time: datetime) -> List[Meeting]:
+        """Meetings that overlap [start_time, end_time)."""
+        start_time, end_time = to_utc(start_time), to_utc(end_time)
+        lo = bisect_left(self._starts, start_time - timedelta(minutes=self._max_duration))
+        hi = bisect_left(self._starts, end_time)
+        found = [
+            m for m_start, m in zip(self._starts[lo:hi], self._meetings[lo:hi])
+            if m_start + timedelta(minutes=m.duration) > start_time
+        ]
+        return self._with_occurrences(found, start_time, end_time, lambda m: True)
+
+    def within(self, start_time: datetime, end_time: datetime) -> List[Meeting]:
+        """Meetings that start and end inside [start_time, end_time]."""
+        start_time, end_time = to_utc(start_time), to_utc(end_time)
+        lo = bisect_left(self._starts, start_time)
+        hi = bisect_right(self._starts, end_time)
+        found = [
+            m for m_start, m in zip(self._starts[lo:hi], self._meetings[lo:hi])
+            if m_start + timedelta(minutes=m.duration) <= end_time
+        ]
+        return self._with_occurrences(
+            found, start_time, end_time,
+            lambda m: to_utc(m.start_time) >= start_time
+            and to_utc(m.start_time) + timedelta(minutes=m.duration) <= end_time
+        )
+
+    def _starting(self, start_time: datetime, end_time: datetime) -> List[Tuple[datetime, Meeting]]:
+        """One-off meetings that start in [start_time, end_time)."""
+        lo = bisect_left(self._starts, start_time)
+        hi = bisect_left(self._starts, end_time)
+        return list(zip(self._starts[lo:hi], self._meetings[lo:hi]))
+
+    def summary(self, start_time: datetime, end_time: datetime) -> Dict:
+        """
+        Count, total minutes and start-hour histogram of the meetings `within` returns.
+        Whole UTC days come from the per-day totals; only the partial days at either
+        edge, meetings running past the end, and recurring occurrences are visited.
+        """
+        start_time, end_time = to_utc(start_time), to_utc(end_time)
+        first_day = start_time.date() + timedelta(days=1 if start_time.time() != time(0) else 0)
+        last_day = end_time.date()
+        count, minutes, hours = 0, 0, [0] * 24
+
+        def visit(meeting: Meeting, sign: int = 1) -> None:
+            nonlocal count, minutes
+            count += sign
+            minutes += sign * meeting.duration
+            hours[meeting.start_time.hour] += sign
+
+        if first_day >= last_day:
+            for meeting in self.within(start_time, end_time):
+                visit(meeting)
+        else:
+            day = first_day
+            while day < last_day:
+                totals = self._days.get(day)
+                if totals is not None:
+                    count += totals.count
+                    minutes += totals.minutes
+                    hours = [a + b for a, b in zip(hours, totals.hours)]
+                day += timedelta(days=1)
+
+            whole_start = pytz.UTC.localize(datetime.combine(first_day, time(0)))
+            whole_end = pytz.UTC.localize(datetime.combine(last_day, time(0)))
+            # Partial days at the edges (the end is inclusive, as in `within`)
+            edges = self._starting(start_time, whole_start) + self._starting(
+                whole_end, end_time + timedelta(microseconds=1))
+            for m_start, meeting in edges:
+                if m_start + timedelta(minutes=meeting.duration) <= end_time:
+                    visit(meeting)
+            # Meetings counted in the last whole day that run past the end of the range
+            spill_from = max(whole_start, end_time - timedelta(minutes=self._max_duration))
+            for m_start, meeting in self._starting(spill_from, whole_end):
+                if m_start + timedelta(minutes=meeting.duration) > end_time:
+                    visit(meeting, -1)
+            for occurrence in self._with_occurrences([], start_time, end_time, lambda m: (
+                to_utc(m.start_time) >= start_time
+                and to_utc(m.start_time) + timedelta(minutes=m.duration) <= end_time
+            )):
+                visit(occurrence)
+
+        return {
+            "count": count,
+            "total_minutes": minutes,
+            "hour_distribution": {hour: n for hour, n in enumerate(hours) if n}
+        }
+
+    def _with_occurrences(self, found: List[Meeting], start_time: datetime, end_time: datetime, keep) -> List[Meeting]:
+        """Add the recurring occurrences in the window that pass `keep`, keeping start order."""
+        if not self._recurring:
+            return found
+        for master in self._recurring.values():
+            found.extend(m for m in expand(master, start_time, end_time) if keep(m))
+        found.sort(key=lambda m: to_utc(m.start_time))
+        return found
 
 class MemoryStore:
     def __init__(self):
         self.meetings: Dict[str, Meeting] = {}
         self.users: Dict[str, User] = {}
-        self.user_calendars: Dict[str, List[Meeting]] = {}
+        self.user_calendars: Dict[str, UserCalendar] = {}
+
+    @contextmanager
+    def batch(self):
+        """Group a run of changes; a no-op in memory, one transaction for persistent stores."""
+        yield self
+
+    def close(self) -> None:
+        """Release resources at shutdown; nothing to do in memory."""
+
+    def _calendar(self, user_id: str) -> UserCalendar:
+        if user_id not in self.user_calendars:
+            self.user_calendars[user_id] = UserCalendar()
+        return self.user_calendars[user_id]
 
     def add_meeting(self, meeting: Meeting) -> None:
         """Add a meeting to storage and update user calendars."""
         self.meetings[meeting.id] = meeting
         for participant in meeting.participants:
-            if participant not in self.user_calendars:
-                self.user_calendars[participant] = []
-            self.user_calendars[participant].append(meeting)
+            self._calendar(participant).add(meeting)
 
     def get_meeting(self, meeting_id: str) -> Optional[Meeting]:
         """Get a meeting by ID."""
         return self.meetings.get(meeting_id)
 
     def get_user_meetings(self, user_id: str) -> List[Meeting]:
-        """Get all meetings for a user."""
-        return self.user_calendars.get(user_id, [])
+        """Get all meetings for a user, ordered by start time."""
+        calendar = self.user_calendars.get(user_id)
+        return list(calendar) if calendar else []
 
     def add_user(self, user: User) -> None:
         """Add a user to storage."""
         self.users[user.id] = user
-        if user.id not in self.user_calendars:
-            self.user_calendars[user.id] = []
+        self._calendar(user.id)
 
     def get_user(self, user_id: str) -> Optional[User]:
         """Get a user by ID."""
         return self.users.get(user_id)
 
     def get_user_meetings_in_range(
-        self, 
-        user_id: str, 
-        start_time: datetime, 
+        self,
+        user_id: str,
+        start_time: datetime,
         end_time: datetime
     ) -> List[Meeting]:
         """Get all meetings for a user within a time range."""
-        meetings = self.get_user_meetings(user_id)
-        return [
-            m for m in meetings 
-            if (m.start_time >= start_time and 
-                m.start_time + timedelta(minutes=m.duration) <= end_time)
-        ]
+        calendar = self.user_calendars.get(user_id)
+        return calendar.within(start_time, end_time) if calendar else []
+
+    def get_user_meetings_overlapping(
+        self,
+        user_id: str,
+        start_time: datetime,
+        end_time: datetime
+    ) -> List[Meeting]:
+        """Get a user's meetings that overlap a time range."""
+        calendar = self.user_calendars.get(user_id)
+        return calendar.overlapping(start_time, end_time) if calendar else []
+
+    def get_user_meeting_summary(
+        self,
+        user_id: str,
+        start_time: datetime,
+        end_time: datetime
+    ) -> Dict:
+        """Count, total minutes and start-hour histogram of a user's meetings within a time range."""
+        calendar = self.user_calendars.get(user_id)
+        if not calendar:
+            return {"count": 0, "total_minutes": 0, "hour_distribution": {}}
+        return calendar.summary(start_time, end_time)
+
+    def _remove_from_calendars(self, meeting: Meeting) -> None:
+        for participant in meeting.participants:
+            if participant in self.user_calendars:
+                self.user_calendars[participant].remove(meeting.id)
 
     def update_meeting(self, meeting: Meeting) -> None:
         """Update an existing meeting."""
         if meeting.id not in self.meetings:
             raise KeyError(f"Meeting {meeting.id} not found")
-        
+
         # Remove from user calendars
-        old_meeting = self.meetings[meeting.id]
-        for participant in old_meeting.participants:
-            if participant in self.user_calendars:
-                self.user_calendars[participant] = [
-                    m for m in self.user_calendars[participant] 
-                    if m.id != meeting.id
-                ]
-        
+        self._remove_from_calendars(self.meetings[meeting.id])
+
         # Add updated meeting
         self.add_meeting(meeting)
 
@@ -69,13 +274,6 @@ class MemoryStore:
         """Delete a meeting and remove it from user calendars."""
         if meeting_id not in self.meetings:
             return
-        
-        meeting = self.meetings[meeting_id]
-        for participant in meeting.participants:
-            if participant in self.user_calendars:
-                self.user_calendars[participant] = [
-                    m for m in self.user_calendars[participant] 
-                    if m.id != meeting_id
-                ]
-        
-        del self.meetings[meeting_id] 
\ No newline at end of file
+
+        self._remove_from_calendars(self.meetings[meeting_id])
+        del self.meetings[meeting_id]
\ No newline at end of file
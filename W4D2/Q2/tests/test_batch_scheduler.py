@@ -0,0 +1,87 @@
+import pytest
+import random
+from datetime import datetime, timedelta
+from src.models import Meeting, User, to_utc
+from src.storage import MemoryStore
+from src.batch_scheduler import BatchScheduler
+
+@pytest.fixture
+def store():
+    store = MemoryStore()
+    for i in range(20):
+        store.add_user(User(id=f"user{i}"))
+    return store
+
+def _request(key, participants, duration, **preferences):
+    return Meeting(id=key, title=key, participants=participants,
+                   start_time=datetime(2024, 3, 18), duration=duration, preferences=preferences)
+
+def _assert_no_overlaps(store, placements):
+    busy = {}
+    for placement in placements:
+        for participant in placement["meeting"].participants:
+            busy.setdefault(participant, []).append((placement["start"], placement["end"]))
+    for participant, intervals in busy.items():
+        for meeting in store.get_user_meetings(participant):
+            start = to_utc(meeting.start_time)
+            intervals.append((start, start + timedelta(minutes=meeting.duration)))
+        intervals.sort()
+        for (_, end), (start, _) in zip(intervals, intervals[1:]):
+            assert end <= start, participant
+
+def test_batch_keeps_meetings_back_to_back(store):
+    store.add_meeting(Meeting(id="existing", title="Existing", participants=["user1"],
+                              start_time=datetime(2024, 3, 18, 9, 0), duration=60))
+    scheduler = BatchScheduler(store, datetime(2024, 3, 18, 9, 0), datetime(2024, 3, 18, 17, 0))
+    result = scheduler.schedule([
+        _request("a", ["user1", "user2"], 30),
+        _request("b", ["user1"], 60, priority="high"),
+        _request("c", ["user2"], 30, not_before="2024-03-18T14:00:00"),
+    ])
+
+    starts = {p["meeting"].id: p["start"].replace(tzinfo=None) for p in result["placements"]}
+    assert result["unplaceable"] == []
+    # user1's meetings form one block, user2's another
+    assert starts["b"] == datetime(2024, 3, 18, 10, 0)
+    assert starts["a"] == datetime(2024, 3, 18, 11, 0)
+    assert starts["c"] == datetime(2024, 3, 18, 14, 0)
+    assert result["meeting_blocks_after"] == 3
+    _assert_no_overlaps(store, result["placements"])
+
+def test_batch_reports_unplaceable_and_repairs(store):
+    scheduler = BatchScheduler(store, datetime(2024, 3, 18, 9, 0), datetime(2024, 3, 18, 11, 0))
+    result = scheduler.schedule([
+        # Placed first, at 9:00, then moved aside so "fixed" fits
+        _request("flexible", ["user1"], 60, priority="high"),
+        _request("fixed", ["user1"], 60, not_before="2024-03-18T09:00:00",
+                 not_after="2024-03-18T10:00:00"),
+        _request("too_long", ["user2"], 180),
+    ])
+
+    starts = {p["meeting"].id: p["start"].replace(tzinfo=None) for p in result["placements"]}
+    assert starts == {"fixed": datetime(2024, 3, 18, 9, 0), "flexible": datetime(2024, 3, 18, 10, 0)}
+    assert [u["meeting"].id for u in result["unplaceable"]] == ["too_long"]
+
+def test_batch_rejects_duplicate_ids(store):
+    scheduler = BatchScheduler(store, datetime(2024, 3, 18, 9, 0), datetime(2024, 3, 18, 17, 0))
+    with pytest.raises(ValueError, match="dup"):
+        scheduler.schedule([
+            _request("dup", ["user1"], 30),
+            _request("other", ["user2"], 30),
+            _request("dup", ["user3"], 60),
+        ])
+
+def test_batch_week_of_200_meetings(store):
+    rng = random.Random(3)
+    users = [f"user{i}" for i in range(20)]
+    meetings = [
+        _request(f"m{i}", rng.sample(users, rng.randint(2, 5)), rng.choice([30, 60]),
+                 priority=rng.choice(["high", "medium", "low"]))
+        for i in range(200)
+    ]
+    scheduler = BatchScheduler(store, datetime(2024, 3, 18), datetime(2024, 3, 23))
+    result = scheduler.schedule(meetings)
+
+    assert len(result["placements"]) + len(result["unplaceable"]) == 200
+    assert len(result["placements"]) > 150
+    _assert_no_overlaps(store, result["placements"])
\ No newline at end of file
@@ -0,0 +1,88 @@
+import pytest
+from datetime import datetime, timedelta
+from src.models import Meeting, User
+from src.storage import MemoryStore
+from src.importer import parse_ical_meetings, parse_json_meetings, find_import_conflicts
+
+@pytest.fixture
+def store():
+    store = MemoryStore()
+    for user_id in ["user1", "user2", "user3"]:
+        store.add_user(User(id=user_id))
+    return store
+
+def test_recurring_meeting_expands_in_range(store):
+    standup = Meeting(
+        id="standup",
+        title="Standup",
+        participants=["user1"],
+        start_time=datetime(2024, 3, 18, 9, 0),
+        duration=15,
+        recurrence="FREQ=DAILY;COUNT=5"
+    )
+    store.add_meeting(standup)
+
+    meetings = store.get_user_meetings_in_range("user1", datetime(2024, 3, 19), datetime(2024, 3, 21))
+    assert [m.start_time for m in meetings] == [datetime(2024, 3, 19, 9, 0), datetime(2024, 3, 20, 9, 0)]
+    assert all(m.series_id == "standup" for m in meetings)
+
+    overlapping = store.get_user_meetings_overlapping(
+        "user1", datetime(2024, 3, 22, 9, 10), datetime(2024, 3, 22, 10, 0)
+    )
+    assert len(overlapping) == 1
+    assert store.get_user_meetings_in_range("user1", datetime(2024, 3, 23), datetime(2024, 3, 30)) == []
+
+    store.delete_meeting("standup")
+    assert store.get_user_meetings("user1") == []
+
+def test_import_conflicts_within_batch_and_store(store):
+    store.add_meeting(Meeting(
+        id="existing",
+        title="Existing",
+        participants=["user3"],
+        start_time=datetime(2024, 3, 20, 14, 0),
+        duration=60
+    ))
+    meetings = parse_json_meetings([
+        {"id": "a", "title": "A", "participants": ["user1"], "start_time": "2024-03-20T10:00:00", "duration": 60},
+        {"id": "b", "title": "B", "participants": ["user1", "user2"], "start_time": "2024-03-20T10:30:00", "duration": 30},
+        {"id": "c", "title": "C", "participants": ["user2"], "start_time": "2024-03-20T12:00:00", "duration": 30},
+        {"id": "d", "title": "D", "participants": ["user3"], "start_time": "2024-03-19T14:30:00",
+         "duration": 30, "recurrence": "FREQ=DAILY;COUNT=3"},
+    ])
+
+    conflicts = find_import_conflicts(store, meetings)
+    assert set(conflicts) == {"a", "b", "d"}
+    assert conflicts["d"][0]["conflicting_meeting"] == "Existing"
+
+def test_parse_ical_meetings():
+    calendar = "\r\n".join([
+        "BEGIN:VCALENDAR",
+        "BEGIN:VEVENT",
+        "UID:weekly-1",
+        "SUMMARY:Weekly",
+        "  planning",
+        "DTSTART;TZID=America/New_York:20240320T100000",
+        "DURATION:PT45M",
+        "RRULE:FREQ=WEEKLY;COUNT=4",
+        "ATTENDEE;CN=One:mailto:user1",
+        "ATTENDEE:mailto:user2",
+        "END:VEVENT",
+        "BEGIN:VEVENT",
+        "SUMMARY:Review",
+        "DTSTART:20240321T150000Z",
+        "DTEND:20240321T153000Z",
+        "ATTENDEE:mailto:user1",
+        "END:VEVENT",
+        "END:VCALENDAR",
+    ])
+    weekly, review = parse_ical_meetings(calendar)
+
+    assert weekly.id == "weekly-1"
+    assert weekly.title == "Weekly planning"
+    assert weekly.participants == ["user1", "user2"]
+    assert weekly.duration == 45
+    assert weekly.recurrence == "FREQ=WEEKLY;COUNT=4"
+    assert weekly.start_time.utcoffset() == timedelta(hours=-4)
+    assert review.duration == 30
+    assert review.recurrence is None
\ No newline at end of file
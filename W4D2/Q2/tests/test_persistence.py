@@ -0,0 +1,92 @@
+import pytest
+from datetime import datetime, timedelta
+from src.models import Meeting, User
+from src.persistence import SQLiteStore
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "meetings.db")
+
+def make_meeting(meeting_id, start, participants=("user1", "user2")):
+    return Meeting(
+        id=meeting_id,
+        title=f"Meeting {meeting_id}",
+        participants=list(participants),
+        start_time=start,
+        duration=30
+    )
+
+def test_meetings_survive_restart(db_path):
+    start = datetime(2024, 3, 20, 10, 0)
+    store = SQLiteStore(db_path)
+    store.add_user(User(id="user1", timezone="Europe/Paris"))
+    store.add_meeting(make_meeting("m1", start))
+    store.add_meeting(make_meeting("m2", start + timedelta(hours=1)))
+    store.delete_meeting("m2")
+    store.pool.close()  # simulate a crash: no snapshot written
+
+    reopened = SQLiteStore(db_path)
+    assert set(reopened.meetings) == {"m1"}
+    assert reopened.get_user("user1").timezone == "Europe/Paris"
+    assert [m.id for m in reopened.get_user_meetings("user2")] == ["m1"]
+
+def test_update_is_persisted(db_path):
+    start = datetime(2024, 3, 20, 10, 0)
+    store = SQLiteStore(db_path)
+    store.add_meeting(make_meeting("m1", start))
+    store.update_meeting(make_meeting("m1", start + timedelta(days=1), participants=["user3"]))
+    store.pool.close()
+
+    reopened = SQLiteStore(db_path)
+    assert reopened.get_user_meetings("user1") == []
+    assert reopened.get_meeting("m1").start_time == start + timedelta(days=1)
+
+def test_snapshot_used_only_when_current(db_path):
+    start = datetime(2024, 3, 20, 10, 0)
+    store = SQLiteStore(db_path)
+    with store.batch():
+        for i in range(10):
+            store.add_meeting(make_meeting(f"m{i}", start + timedelta(hours=i)))
+    store.close()
+
+    reopened = SQLiteStore(db_path)
+    assert len(reopened.meetings) == 10
+    # A write after the snapshot makes it stale, so the next start rebuilds from SQLite
+    reopened.delete_meeting("m0")
+    reopened.pool.close()
+
+    rebuilt = SQLiteStore(db_path)
+    assert len(rebuilt.meetings) == 9
+    assert rebuilt.get_meeting("m0") is None
+
+def test_batch_is_single_transaction(db_path):
+    store = SQLiteStore(db_path)
+    generation = store.generation
+    with store.batch():
+        for i in range(5):
+            store.add_meeting(make_meeting(f"m{i}", datetime(2024, 3, 20, 9 + i)))
+    assert store.generation == generation + 1
+
+def test_snapshot_from_other_version_is_ignored(db_path, monkeypatch):
+    store = SQLiteStore(db_path)
+    store.add_meeting(make_meeting("m1", datetime(2024, 3, 20, 10, 0)))
+    monkeypatch.setattr("src.persistence.SNAPSHOT_VERSION", 1)
+    store.close()
+    monkeypatch.undo()
+
+    rebuilds = []
+    rebuild = SQLiteStore._rebuild_from_db
+    monkeypatch.setattr(SQLiteStore, "_rebuild_from_db", lambda self: rebuilds.append(1) or rebuild(self))
+    reopened = SQLiteStore(db_path)
+    assert rebuilds == [1]
+    assert [m.id for m in reopened.get_user_meetings("user1")] == ["m1"]
+
+def test_unreadable_snapshot_falls_back_to_database(db_path):
+    store = SQLiteStore(db_path)
+    store.add_meeting(make_meeting("m1", datetime(2024, 3, 20, 10, 0)))
+    store.close()
+    with open(store.snapshot_path, "wb") as f:
+        f.write(b"not a pickle")
+
+    reopened = SQLiteStore(db_path)
+    assert set(reopened.meetings) == {"m1"}
\ No newline at end of file
@@ -0,0 +1,79 @@
+import pytest
+from datetime import datetime, timedelta
+import pytz
+from src.models import Meeting, User
+from src.storage import MemoryStore
+from src.scheduling import merge_intervals, subtract_intervals, find_free_slots, working_windows
+
+@pytest.fixture
+def store():
+    store = MemoryStore()
+    for user_id in ["user1", "user2"]:
+        store.add_user(User(id=user_id))
+    return store
+
+def test_merge_intervals():
+    base = datetime(2024, 3, 20, 9, 0)
+    intervals = [
+        (base + timedelta(hours=2), base + timedelta(hours=3)),
+        (base, base + timedelta(hours=1)),
+        (base + timedelta(minutes=30), base + timedelta(hours=1, minutes=30)),
+        (base + timedelta(hours=3), base + timedelta(hours=4)),
+    ]
+    assert merge_intervals(intervals) == [
+        (base, base + timedelta(hours=1, minutes=30)),
+        (base + timedelta(hours=2), base + timedelta(hours=4)),
+    ]
+
+def test_subtract_intervals():
+    base = datetime(2024, 3, 20, 9, 0)
+    available = [(base, base + timedelta(hours=8))]
+    busy = [(base + timedelta(hours=1), base + timedelta(hours=2))]
+    assert subtract_intervals(available, busy) == [
+        (base, base + timedelta(hours=1)),
+        (base + timedelta(hours=2), base + timedelta(hours=8)),
+    ]
+
+def test_find_free_slots_skips_busy_time(store):
+    day = datetime(2024, 3, 20)
+    store.add_meeting(Meeting(id="m1", title="Busy", participants=["user2"],
+                              start_time=day.replace(hour=10), duration=60))
+
+    slots = find_free_slots(store, ["user1", "user2"], 30, day, day + timedelta(days=1))
+    starts = [s["start"].replace(tzinfo=None) for s in slots]
+
+    assert day.replace(hour=9) in starts
+    assert day.replace(hour=10) not in starts
+    assert day.replace(hour=10, minute=30) not in starts
+    assert day.replace(hour=11) in starts
+    # Working hours end at 17:00, so the last 30-minute slot starts at 16:30
+    assert max(starts) == day.replace(hour=16, minute=30)
+
+def test_find_free_slots_uses_participant_timezone(store):
+    store.add_user(User(id="tokyo", timezone="Asia/Tokyo"))
+    day = datetime(2024, 3, 20, tzinfo=pytz.UTC)
+
+    slots = find_free_slots(store, ["tokyo"], 60, day, day + timedelta(days=1))
+
+    # 09:00-17:00 in Tokyo is 00:00-08:00 UTC
+    assert slots[0]["start"] == day
+    assert slots[-1]["end"] == day + timedelta(hours=8)
+
+def test_find_free_slots_no_common_hours(store):
+    store.add_user(User(id="tokyo", timezone="Asia/Tokyo"))
+    day = datetime(2024, 3, 20, tzinfo=pytz.UTC)
+
+    assert find_free_slots(store, ["user1", "tokyo"], 30, day, day + timedelta(days=1)) == []
+
+def test_working_windows_follow_dst():
+    user = User(id="nyc", timezone="America/New_York")
+    start = datetime(2024, 3, 8, tzinfo=pytz.UTC)
+
+    windows = working_windows(user, start, start + timedelta(days=4))
+
+    # 09:00 New York is 14:00 UTC before the March 10 change and 13:00 UTC after it
+    assert windows[0] == (datetime(2024, 3, 8, 14, tzinfo=pytz.UTC), datetime(2024, 3, 8, 22, tzinfo=pytz.UTC))
+    assert windows[-1] == (datetime(2024, 3, 11, 13, tzinfo=pytz.UTC), datetime(2024, 3, 11, 21, tzinfo=pytz.UTC))
+    # A repeat query is served from the cache and can't be mutated through the result
+    windows.clear()
+    assert working_windows(user, start, start + timedelta(days=4))[0][0].hour == 14
\ No newline at end of file
@@ -1,4 +1,6 @@
 import pytest
+import random
+from collections import Counter
 from datetime import datetime, timedelta
 from src.models import Meeting, User
 from src.storage import MemoryStore
@@ -105,4 +107,79 @@ def test_delete_meeting(store, sample_meeting):
     
     assert store.get_meeting(sample_meeting.id) is None
     for participant in sample_meeting.participants:
-        assert sample_meeting not in store.get_user_meetings(participant) 
\ No newline at end of file
+        assert sample_meeting not in store.get_user_meetings(participant) 
+
+def test_user_meetings_sorted_by_start(store):
+    now = datetime(2024, 3, 20, 9, 0)
+    for i, offset in enumerate([3, 1, 2]):
+        store.add_meeting(Meeting(
+            id=f"m{i}",
+            title=f"Meeting {i}",
+            participants=["user1"],
+            start_time=now + timedelta(hours=offset),
+            duration=30
+        ))
+
+    starts = [m.start_time for m in store.get_user_meetings("user1")]
+    assert starts == sorted(starts)
+
+def test_get_user_meetings_overlapping(store):
+    start = datetime(2024, 3, 20, 9, 0)
+    store.add_meeting(Meeting(id="long", title="Workshop", participants=["user1"],
+                              start_time=start, duration=240))
+    store.add_meeting(Meeting(id="short", title="Standup", participants=["user1"],
+                              start_time=start + timedelta(hours=5), duration=15))
+
+    # 11:00-11:30 falls inside the 4-hour workshop that started two hours earlier
+    overlapping = store.get_user_meetings_overlapping(
+        "user1", start + timedelta(hours=2), start + timedelta(hours=2, minutes=30)
+    )
+    assert [m.id for m in overlapping] == ["long"]
+
+    # Back-to-back is not an overlap
+    assert store.get_user_meetings_overlapping(
+        "user1", start + timedelta(hours=4), start + timedelta(hours=5)
+    ) == []
+
+def test_update_meeting_moves_calendar_entry(store, sample_meeting):
+    store.add_meeting(sample_meeting)
+    moved = Meeting(
+        id=sample_meeting.id,
+        title=sample_meeting.title,
+        participants=["user1"],
+        start_time=sample_meeting.start_time + timedelta(days=1),
+        duration=30
+    )
+    store.update_meeting(moved)
+
+    assert store.get_user_meetings("user2") == []
+    assert store.get_user_meetings_overlapping(
+        "user1", sample_meeting.start_time, sample_meeting.start_time + timedelta(minutes=30)
+    ) == []
+    assert store.get_user_meetings("user1") == [moved]
+
+def test_meeting_summary_matches_range_scan(store):
+    rng = random.Random(7)
+    base = datetime(2024, 3, 1)
+    for i in range(300):
+        store.add_meeting(Meeting(
+            id=f"m{i}",
+            title=f"Meeting {i}",
+            participants=["user1"],
+            start_time=base + timedelta(minutes=rng.randrange(0, 30 * 24 * 60, 15)),
+            duration=rng.choice([15, 30, 60, 180])
+        ))
+    store.add_meeting(Meeting(id="weekly", title="Weekly", participants=["user1"],
+                              start_time=base + timedelta(hours=10), duration=60,
+                              recurrence="FREQ=WEEKLY;COUNT=5"))
+    for i in range(0, 300, 3):
+        store.delete_meeting(f"m{i}")
+
+    for _ in range(50):
+        start = base + timedelta(minutes=rng.randrange(0, 30 * 24 * 60))
+        end = start + timedelta(minutes=rng.randrange(0, 20 * 24 * 60))
+        meetings = store.get_user_meetings_in_range("user1", start, end)
+        summary = store.get_user_meeting_summary("user1", start, end)
+        assert summary["count"] == len(meetings)
+        assert summary["total_minutes"] == sum(m.duration for m in meetings)
+        assert summary["hour_distribution"] == dict(Counter(m.start_time.hour for m in meetings))
\ No newline at end of file
@@ -0,0 +1,73 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Tuple
+
+logger = logging.getLogger(__name__)
+
+class ChannelResolver:
+    """
+    Resolves channel ids to channel objects with as few REST calls as possible:
+    the gateway cache first, then a TTL cache of fetched channels, and only then
+    fetch_channel. Concurrent lookups of the same uncached id share one fetch.
+    """
+
+    def __init__(self, bot, ttl: float = 300.0, max_size: int = 1024):
+        self.bot = bot
+        self.ttl = ttl
+        self.max_size = max_size
+        self._cache: "OrderedDict[int, Tuple[float, Any]]" = OrderedDict()
+        self._inflight: Dict[int, asyncio.Future] = {}
+        self.stats = {"gateway_hits": 0, "cache_hits": 0, "fetches": 0}
+
+    async def resolve(self, channel_id) -> Any:
+        """Get a channel by id, fetching it over REST only on a double cache miss."""
+        channel_id = int(channel_id)
+
+        channel = self.bot.get_channel(channel_id)
+        if channel is not None:
+            self.stats["gateway_hits"] += 1
+            return channel
+
+        entry = self._cache.get(channel_id)
+        if entry is not None:
+            expires_at, channel = entry
+            if expires_at > time.monotonic():
+                self._cache.move_to_end(channel_id)
+                self.stats["cache_hits"] += 1
+                return channel
+            del self._cache[channel_id]
+
+        if channel_id in self._inflight:
+            return await asyncio.shield(self._inflight[channel_id])
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[channel_id] = future
+        try:
+            self.stats["fetches"] += 1
+            channel = await self.bot.fetch_channel(channel_id)
+            self._store(channel_id, channel)
+            future.set_result(channel)
+            return channel
+        except Exception as e:
+            future.set_exception(e)
+            # Mark the exception retrieved in case nobody else was waiting on it
+            future.exception()
+            raise
+        finally:
+            del self._inflight[channel_id]
+
+    def _store(self, channel_id: int, channel: Any) -> None:
+        self._cache[channel_id] = (time.monotonic() + self.ttl, channel)
+        self._cache.move_to_end(channel_id)
+        while len(self._cache) > self.max_size:
+            self._cache.popitem(last=False)
+
+    def invalidate(self, channel_id) -> None:
+        """Forget a channel, e.g. after it was updated or deleted."""
+        if self._cache.pop(int(channel_id), None) is not None:
+            logger.debug(f"Invalidated cached channel {channel_id}")
+
+    def clear(self) -> None:
+        self._cache.clear()
\ No newline at end of file
@@ -1,6 +1,11 @@
 import discord
 from discord.ext import commands
 import logging
+import os
+from .channel_resolver import ChannelResolver
+from .message_index import MessageIndex
+from .rate_limiter import RequestScheduler
+from .inspector.tracing import instrument_http
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -12,6 +17,11 @@ class DiscordBot:
         intents.members = True
         
         self.bot = commands.Bot(command_prefix="!", intents=intents)
+        instrument_http(self.bot.http)
+        self.channels = ChannelResolver(self.bot)
+        self.message_index = MessageIndex(os.getenv("MESSAGE_INDEX_PATH", "messages.db"))
+        # Only deletes of messages the index has seen are coalesced into bulk deletes
+        self.scheduler = RequestScheduler(known_message=self.message_index.has_message)
         self.setup_events()
 
     def setup_events(self):
@@ -21,11 +31,33 @@ class DiscordBot:
 
         @self.bot.event
         async def on_message(message):
+            self.message_index.add_message(message)
             if message.author == self.bot.user:
                 return
             logger.info(f"Message received: {message.content} from {message.author}")
             await self.bot.process_commands(message)
 
+        @self.bot.event
+        async def on_raw_message_edit(payload):
+            if "content" in payload.data:
+                self.message_index.update_content(payload.message_id, payload.data["content"])
+
+        @self.bot.event
+        async def on_raw_message_delete(payload):
+            self.message_index.delete_messages([payload.message_id])
+
+        @self.bot.event
+        async def on_raw_bulk_message_delete(payload):
+            self.message_index.delete_messages(payload.message_ids)
+
+        @self.bot.event
+        async def on_guild_channel_update(before, after):
+            self.channels.invalidate(after.id)
+
+        @self.bot.event
+        async def on_guild_channel_delete(channel):
+            self.channels.invalidate(channel.id)
+
     async def start_bot(self, token):
         try:
             await self.bot.start(token)
@@ -36,6 +68,7 @@ class DiscordBot:
     async def stop_bot(self):
         try:
             await self.bot.close()
+            self.message_index.close()
         except Exception as e:
             logger.error(f"Failed to stop bot: {e}")
             raise 
\ No newline at end of file
@@ -1,34 +1,233 @@
+import json
 import logging
+import os
+import random
+import time
+from bisect import bisect_left
+from collections import deque
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
 logger = logging.getLogger(__name__)
 
-class MCPInspector:
+# Upper bounds (ms) of the latency histogram buckets; the last bucket is open-ended
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, 30000)
+
+# Tool names get their own histograms up to this many; later names share OTHER_TOOLS
+MAX_TOOL_HISTOGRAMS = 256
+OTHER_TOOLS = "(other)"
+
+class RequestRecord:
+    """One logged request, kept small so the buffer's footprint stays flat."""
+    __slots__ = ("timestamp", "tool", "duration_ms", "status", "payload_size", "discord_ms")
+
+    def __init__(
+        self,
+        timestamp: float,
+        tool: str,
+        duration_ms: float,
+        status: str,
+        payload_size: int,
+        discord_ms: float = 0.0
+    ):
+        self.timestamp = timestamp
+        self.tool = tool
+        self.duration_ms = duration_ms
+        self.status = status
+        self.payload_size = payload_size
+        self.discord_ms = discord_ms
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "timestamp": datetime.fromtimestamp(self.timestamp).isoformat(),
+            "tool": self.tool,
+            "duration_ms": round(self.duration_ms, 3),
+            "status": self.status,
+            "payload_size": self.payload_size,
+            "discord_ms": round(self.discord_ms, 3)
+        }
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram; percentiles are estimated from bucket bounds."""
+    __slots__ = ("counts", "count", "total_ms", "max_ms", "errors")
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.errors = 0
+
+    def add(self, duration_ms: float, ok: bool = True) -> None:
+        self.counts[bisect_left(LATENCY_BUCKETS_MS, duration_ms)] += 1
+        self.count += 1
+        self.total_ms += duration_ms
+        self.max_ms = max(self.max_ms, duration_ms)
+        if not ok:
+            self.errors += 1
+
+    def percentile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-th quantile (the max for the open bucket)."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank and n:
+                return float(LATENCY_BUCKETS_MS[index]) if index < len(LATENCY_BUCKETS_MS) else self.max_ms
+        return self.max_ms
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "mean_ms": round(self.total_ms / self.count, 3) if self.count else 0.0,
+            "max_ms": round(self.max_ms, 3),
+            "p50_ms": self.percentile(0.50),
+            "p95_ms": self.percentile(0.95),
+            "p99_ms": self.percentile(0.99)
+        }
+
+class ToolMetrics:
+    """Latency histograms for one tool: end to end, waiting on Discord, and local work."""
+    __slots__ = ("total", "discord", "local")
+
     def __init__(self):
-        self.requests: List[Dict[str, Any]] = []
+        self.total = LatencyHistogram()
+        self.discord = LatencyHistogram()
+        self.local = LatencyHistogram()
+
+    def add(self, duration_ms: float, discord_ms: float, ok: bool) -> None:
+        self.total.add(duration_ms, ok)
+        self.discord.add(discord_ms)
+        self.local.add(max(duration_ms - discord_ms, 0.0))
+
+    def summary(self) -> Dict[str, Any]:
+        def split(histogram: LatencyHistogram) -> Dict[str, float]:
+            stats = histogram.summary()
+            return {key: stats[key] for key in ("mean_ms", "p50_ms", "p95_ms", "p99_ms")}
+
+        return {**self.total.summary(), "discord": split(self.discord), "local": split(self.local)}
+
+class MCPInspector:
+    """
+    Keeps the most recent requests in a fixed-capacity ring buffer and per-tool
+    latency histograms, so it can stay enabled in production at constant memory.
+    Optionally appends a sample of requests to a JSON-lines file, rotated at a
+    size limit.
+    """
+
+    def __init__(
+        self,
+        capacity: Optional[int] = None,
+        spill_path: Optional[str] = None,
+        sample_rate: Optional[float] = None,
+        spill_max_bytes: Optional[int] = None
+    ):
+        self.capacity = capacity or int(os.getenv("INSPECTOR_CAPACITY", "1000"))
+        self.requests: deque = deque(maxlen=self.capacity)
+        self.histograms: Dict[str, ToolMetrics] = {}
+        self.spill_path = spill_path or os.getenv("INSPECTOR_SPILL_PATH")
+        self.sample_rate = sample_rate if sample_rate is not None else float(os.getenv("INSPECTOR_SAMPLE_RATE", "0.01"))
+        self.spill_max_bytes = spill_max_bytes or int(os.getenv("INSPECTOR_SPILL_MAX_BYTES", str(50 * 1024 * 1024)))
+        self._spill = None
+
+    def record(
+        self,
+        tool: str,
+        duration_ms: float,
+        status: str = "ok",
+        payload_size: int = 0,
+        discord_ms: float = 0.0
+    ) -> None:
+        """Fast path for instrumented calls: buffer the record and update the tool's histograms."""
+        record = RequestRecord(time.time(), tool, duration_ms, status, payload_size, discord_ms)
+        self.requests.append(record)
+        metrics = self.histograms.get(tool)
+        if metrics is None:
+            # Names come from callers, so cap how many histograms they can create
+            if len(self.histograms) >= MAX_TOOL_HISTOGRAMS:
+                tool = OTHER_TOOLS
+            metrics = self.histograms.get(tool)
+            if metrics is None:
+                metrics = self.histograms[tool] = ToolMetrics()
+        metrics.add(duration_ms, discord_ms, status == "ok")
+        if self.spill_path and random.random() < self.sample_rate:
+            self._write_spill(record)
 
     def log_request(self, request_data: Dict[str, Any]) -> bool:
         """Log a request for debugging purposes."""
         try:
-            self.requests.append({
-                "timestamp": datetime.now().isoformat(),
-                "data": request_data
-            })
+            payload_size = request_data.get("payload_size")
+            if payload_size is None:
+                payload_size = len(json.dumps(request_data.get("params", request_data), default=str))
+            self.record(
+                request_data.get("tool", "unknown"),
+                float(request_data.get("duration_ms", 0.0)),
+                request_data.get("status", "ok"),
+                payload_size,
+                float(request_data.get("discord_ms", 0.0))
+            )
             return True
         except Exception as e:
             logger.error(f"Failed to log request: {e}")
             return False
 
-    def get_recent_requests(self, limit: int = 10) -> List[Dict[str, Any]]:
-        """Get recent requests for inspection."""
-        return self.requests[-limit:]
+    def _write_spill(self, record: RequestRecord) -> None:
+        try:
+            if self._spill is None:
+                self._spill = open(self.spill_path, "a", buffering=1)
+            self._spill.write(json.dumps(record.to_dict()) + "\n")
+            if self._spill.tell() >= self.spill_max_bytes:
+                self._spill.close()
+                os.replace(self.spill_path, self.spill_path + ".1")
+                self._spill = None
+        except OSError as e:
+            logger.error(f"Failed to spill request record: {e}")
+
+    def get_recent_requests(
+        self,
+        limit: int = 10,
+        tool: Optional[str] = None,
+        status: Optional[str] = None,
+        min_duration_ms: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        """Get recent requests for inspection, newest last, optionally filtered."""
+        if limit <= 0:
+            return []
+        matched = []
+        for record in reversed(self.requests):
+            if tool is not None and record.tool != tool:
+                continue
+            if status is not None and record.status != status:
+                continue
+            if min_duration_ms is not None and record.duration_ms < min_duration_ms:
+                continue
+            matched.append(record.to_dict())
+            if len(matched) >= limit:
+                break
+        matched.reverse()
+        return matched
+
+    def get_latency_stats(self, tool: Optional[str] = None) -> Dict[str, Any]:
+        """Latency summary per tool (or for one tool), with Discord wait split from local time."""
+        if tool is not None:
+            metrics = self.histograms.get(tool)
+            return {tool: metrics.summary()} if metrics else {}
+        return {name: metrics.summary() for name, metrics in self.histograms.items()}
 
     def clear_requests(self) -> bool:
         """Clear all logged requests."""
         try:
             self.requests.clear()
+            self.histograms.clear()
             return True
         except Exception as e:
             logger.error(f"Failed to clear requests: {e}")
-            return False 
\ No newline at end of file
+            return False
+
+    def close(self) -> None:
+        if self._spill is not None:
+            self._spill.close()
+            self._spill = None
\ No newline at end of file
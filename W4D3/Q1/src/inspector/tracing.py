@@ -0,0 +1,85 @@
+import functools
+import json
+import logging
+import time
+from contextvars import ContextVar
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+class CallTiming:
+    """Discord time spent on behalf of one tool call: HTTP requests and rate-limit queueing."""
+    __slots__ = ("api_seconds", "api_calls", "queue_seconds")
+
+    def __init__(self):
+        self.api_seconds = 0.0
+        self.api_calls = 0
+        self.queue_seconds = 0.0
+
+_current_timing: ContextVar[Optional[CallTiming]] = ContextVar("discord_call_timing", default=None)
+
+def current_timing() -> Optional[CallTiming]:
+    """The timing of the tool call running in this context, if it is traced."""
+    return _current_timing.get()
+
+def bind_timing(timing: Optional[CallTiming]):
+    """Attribute Discord time in this context to `timing`; returns a token for unbind_timing."""
+    return _current_timing.set(timing)
+
+def unbind_timing(token) -> None:
+    _current_timing.reset(token)
+
+def instrument_http(http) -> None:
+    """Wrap a discord.py HTTPClient so every request's wall time is added to the current call."""
+    if getattr(http, "_traced", False):
+        return
+    original = http.request
+
+    @functools.wraps(original)
+    async def request(*args, **kwargs):
+        timing = _current_timing.get()
+        if timing is None:
+            return await original(*args, **kwargs)
+        started = time.perf_counter()
+        try:
+            return await original(*args, **kwargs)
+        finally:
+            timing.api_seconds += time.perf_counter() - started
+            timing.api_calls += 1
+
+    http.request = request
+    http._traced = True
+
+def trace_tool(inspector, name: str, func: Callable) -> Callable:
+    """
+    Wrap a tool so each call is timed and recorded in the inspector, with the time
+    spent waiting on Discord (HTTP plus rate-limit queueing) split from local work.
+    A result of {"success": False, ...} or an exception is recorded as an error.
+    """
+    @functools.wraps(func)
+    async def traced(*args, **kwargs) -> Any:
+        timing = CallTiming()
+        token = bind_timing(timing)
+        status = "error"
+        started = time.perf_counter()
+        try:
+            result = await func(*args, **kwargs)
+            if not (isinstance(result, dict) and result.get("success") is False):
+                status = "ok"
+            return result
+        finally:
+            duration_ms = (time.perf_counter() - started) * 1000
+            unbind_timing(token)
+            try:
+                payload_size = len(json.dumps(kwargs, default=str))
+            except (TypeError, ValueError):
+                payload_size = 0
+            inspector.record(
+                name,
+                duration_ms,
+                status,
+                payload_size,
+                discord_ms=(timing.api_seconds + timing.queue_seconds) * 1000
+            )
+
+    return traced
\ No newline at end of file
@@ -1,5 +1,6 @@
 import logging
 import asyncio
+from typing import Optional
 from fastmcp import FastMCP
 from .discord_bot import DiscordBot
 from .tools.message_tools import MessageTools
@@ -7,6 +8,7 @@ from .tools.channel_tools import ChannelTools
 from .tools.moderation_tools import ModerationTools
 from .auth.api_key_auth import APIKeyAuth
 from .inspector.debug import MCPInspector
+from .inspector.tracing import trace_tool
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -27,28 +29,70 @@ class DiscordMCPServer(FastMCP):
 
     def register_tools(self):
         """Register all tools with the MCP server."""
+        def tool(name: str, description: str):
+            """Register a tool whose calls are timed and recorded in the inspector."""
+            def register(func):
+                return self.tool(name=name, description=description)(trace_tool(self.inspector, name, func))
+            return register
+
         # Message tools
-        @self.tool(name="send_message", description="Send a message to a Discord channel")
-        async def send_message(channel_id: str, content: str):
-            return await self.message_tools.send_message(channel_id, content)
+        @tool(name="send_message", description="Send a message to a Discord channel")
+        async def send_message(channel_id: str, content: str, priority: str = "normal"):
+            return await self.message_tools.send_message(channel_id, content, priority)
+
+        @tool(name="get_messages", description="Get a page of messages from a Discord channel; page with before/after message id cursors")
+        async def get_messages(
+            channel_id: str,
+            limit: int = 100,
+            before: Optional[str] = None,
+            after: Optional[str] = None
+        ):
+            return await self.message_tools.get_messages(channel_id, limit, before, after)
 
-        @self.tool(name="get_messages", description="Get recent messages from a Discord channel")
-        async def get_messages(channel_id: str, limit: int = 100):
-            return await self.message_tools.get_messages(channel_id, limit)
+        @tool(name="export_messages", description="Stream a Discord channel's history to a JSON-lines file in batches")
+        async def export_messages(
+            channel_id: str,
+            before: Optional[str] = None,
+            after: Optional[str] = None,
+            limit: Optional[int] = None
+        ):
+            return await self.message_tools.export_messages(channel_id, before, after, limit)
 
-        @self.tool(name="search_messages", description="Search for messages in a Discord channel")
-        async def search_messages(channel_id: str, query: str, limit: int = 100):
-            return await self.message_tools.search_messages(channel_id, query, limit)
+        @tool(name="search_messages", description="Search for messages in a Discord channel, optionally by author and date range")
+        async def search_messages(
+            channel_id: str,
+            query: str,
+            limit: int = 100,
+            author: Optional[str] = None,
+            after: Optional[str] = None,
+            before: Optional[str] = None
+        ):
+            return await self.message_tools.search_messages(channel_id, query, limit, author, after, before)
         
         # Channel tools
-        @self.tool(name="get_channel_info", description="Get information about a Discord channel")
+        @tool(name="get_channel_info", description="Get information about a Discord channel")
         async def get_channel_info(channel_id: str):
             return await self.channel_tools.get_channel_info(channel_id)
         
         # Moderation tools
-        @self.tool(name="moderate_content", description="Moderate content in a Discord channel")
-        async def moderate_content(channel_id: str, message_id: str, action: str):
-            return await self.moderation_tools.moderate_content(channel_id, message_id, action)
+        @tool(name="moderate_content", description="Moderate content in a Discord channel")
+        async def moderate_content(channel_id: str, message_id: str, action: str, priority: str = "normal"):
+            return await self.moderation_tools.moderate_content(channel_id, message_id, action, priority)
+
+        @tool(name="get_queue_stats", description="Show queued Discord operations per route and rate-limit counters")
+        async def get_queue_stats():
+            return {
+                "success": True,
+                "stats": self.discord_bot.scheduler.queue_stats()
+            }
+
+        # Not traced itself, so polling it doesn't show up in the numbers it reports
+        @self.tool(name="get_metrics", description="Show p50/p95/p99 latency per tool, split into Discord API wait and local time")
+        async def get_metrics(tool_name: Optional[str] = None):
+            return {
+                "success": True,
+                "metrics": self.inspector.get_latency_stats(tool_name)
+            }
 
     async def authenticate_request(self, api_key: str) -> bool:
         """Authenticate incoming requests."""
@@ -87,6 +131,7 @@ class DiscordMCPServer(FastMCP):
         """Stop the MCP server and Discord bot."""
         try:
             await self.discord_bot.stop_bot()
+            self.inspector.close()
         except Exception as e:
             logger.error(f"Failed to stop server: {e}")
             raise 
\ No newline at end of file
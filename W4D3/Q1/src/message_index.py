@@ -0,0 +1,295 @@
+import asyncio
+import logging
+import re
+import sqlite3
+from datetime import datetime, timezone
+from typing import List, Dict, Any, Optional, Set
+import discord
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS messages (
+    id INTEGER PRIMARY KEY,
+    channel_id INTEGER NOT NULL,
+    author_id INTEGER NOT NULL,
+    author_name TEXT NOT NULL,
+    content TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_messages_channel_created ON messages (channel_id, created_at);
+CREATE VIRTUAL TABLE IF NOT EXISTS messages_fts USING fts5(
+    content, content='messages', content_rowid='id', tokenize='unicode61'
+);
+CREATE TRIGGER IF NOT EXISTS messages_ai AFTER INSERT ON messages BEGIN
+    INSERT INTO messages_fts (rowid, content) VALUES (new.id, new.content);
+END;
+CREATE TRIGGER IF NOT EXISTS messages_ad AFTER DELETE ON messages BEGIN
+    INSERT INTO messages_fts (messages_fts, rowid, content) VALUES ('delete', old.id, old.content);
+END;
+CREATE TRIGGER IF NOT EXISTS messages_au AFTER UPDATE OF content ON messages BEGIN
+    INSERT INTO messages_fts (messages_fts, rowid, content) VALUES ('delete', old.id, old.content);
+    INSERT INTO messages_fts (rowid, content) VALUES (new.id, new.content);
+END;
+CREATE TABLE IF NOT EXISTS backfill_state (
+    channel_id INTEGER PRIMARY KEY,
+    oldest_id INTEGER,
+    complete INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS sync_state (
+    channel_id INTEGER PRIMARY KEY,
+    synced_id INTEGER NOT NULL
+);
+"""
+
+# An upsert rather than INSERT OR REPLACE: REPLACE's implicit delete doesn't fire
+# messages_ad, which would leave a re-inserted message's old words in messages_fts
+INSERT_MESSAGE = """
+INSERT INTO messages (id, channel_id, author_id, author_name, content, created_at)
+VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT(id) DO UPDATE SET
+    channel_id = excluded.channel_id,
+    author_id = excluded.author_id,
+    author_name = excluded.author_name,
+    content = excluded.content,
+    created_at = excluded.created_at
+"""
+
+# Bumped when an index written by an older build needs fixing up on open
+SCHEMA_VERSION = 1
+
+TERM_PATTERN = re.compile(r"\w+")
+
+# Messages written per transaction while walking channel history
+BACKFILL_BATCH = 500
+
+def to_fts_query(query: str) -> str:
+    """Turn free text into an FTS5 query matching every word, the last one as a prefix."""
+    terms = TERM_PATTERN.findall(query.lower())
+    if not terms:
+        return ""
+    quoted = [f'"{term}"' for term in terms]
+    quoted[-1] += "*"
+    return " ".join(quoted)
+
+def _timestamp(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    moment = datetime.fromisoformat(value)
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.timestamp()
+
+def _row(message) -> tuple:
+    return (
+        message.id,
+        message.channel.id,
+        message.author.id,
+        message.author.name,
+        message.content,
+        message.created_at.timestamp()
+    )
+
+class MessageIndex:
+    """
+    Local SQLite full-text index of channel messages. Live messages, edits and
+    deletes are applied from gateway events; each channel's older history is
+    backfilled once (resumably), and anything sent while the bot was offline is
+    caught up the first time the channel is searched after a restart. Both run in
+    the background so searches answer from whatever is indexed so far.
+
+    Catch-up starts from a per-channel high-water mark that only backfill and
+    catch-up advance, so live inserts can't hide a gap left while offline.
+    """
+
+    def __init__(self, db_path: str = "messages.db"):
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+        if self.conn.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+            # Earlier builds re-inserted with REPLACE, which could leave stale terms behind
+            with self.conn:
+                self.conn.execute("INSERT INTO messages_fts (messages_fts) VALUES ('rebuild')")
+            self.conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self._synced: Set[int] = set()
+        self._syncing: Dict[int, asyncio.Task] = {}
+
+    # Live updates
+
+    def add_message(self, message) -> None:
+        self._insert([message])
+
+    def update_content(self, message_id: int, content: str) -> None:
+        with self.conn:
+            self.conn.execute("UPDATE messages SET content = ? WHERE id = ?", (content, message_id))
+
+    def delete_messages(self, message_ids) -> None:
+        with self.conn:
+            self.conn.executemany("DELETE FROM messages WHERE id = ?", [(int(i),) for i in message_ids])
+
+    def has_message(self, channel_id: int, message_id: int) -> bool:
+        return self.conn.execute(
+            "SELECT 1 FROM messages WHERE id = ? AND channel_id = ?", (message_id, channel_id)
+        ).fetchone() is not None
+
+    # History
+
+    def start_sync(self, channel) -> bool:
+        """
+        True if the channel's index is complete; otherwise make sure a background
+        backfill and catch-up is running for it and return False.
+        """
+        if channel.id in self._synced:
+            return True
+        task = self._syncing.get(channel.id)
+        if task is None or task.done():
+            self._syncing[channel.id] = asyncio.create_task(self._sync(channel))
+        return False
+
+    async def ensure_synced(self, channel) -> None:
+        """Wait until the channel's history is backfilled and caught up."""
+        if not self.start_sync(channel):
+            await asyncio.shield(self._syncing[channel.id])
+
+    async def _sync(self, channel) -> None:
+        try:
+            await self._backfill(channel)
+            await self._catch_up(channel)
+            self._synced.add(channel.id)
+        except Exception as e:
+            # Left unsynced, so the next search starts over from the saved state
+            logger.error(f"Failed to sync message index for channel {channel.id}: {e}")
+
+    async def _backfill(self, channel) -> None:
+        row = self.conn.execute(
+            "SELECT oldest_id, complete FROM backfill_state WHERE channel_id = ?", (channel.id,)
+        ).fetchone()
+        if row and row[1]:
+            return
+        # Resume below the oldest message a previous, interrupted backfill reached
+        before = discord.Object(id=row[0]) if row and row[0] else None
+        oldest = row[0] if row else None
+        batch = []
+        async for message in channel.history(limit=None, before=before):
+            batch.append(message)
+            if len(batch) >= BACKFILL_BATCH:
+                oldest = batch[-1].id
+                self._write_batch(batch, channel.id, oldest)
+                batch = []
+        self._write_batch(batch, channel.id, batch[-1].id if batch else oldest, complete=True)
+        logger.info(f"Backfilled message index for channel {channel.id}")
+
+    def _write_batch(self, batch: List, channel_id: int, oldest_id: Optional[int], complete: bool = False) -> None:
+        """Insert a page of history and record how far back the backfill has got, in one transaction."""
+        with self.conn:
+            self.conn.executemany(INSERT_MESSAGE, [_row(m) for m in batch])
+            self.conn.execute(
+                "INSERT OR REPLACE INTO backfill_state (channel_id, oldest_id, complete) VALUES (?, ?, ?)",
+                (channel_id, oldest_id, int(complete))
+            )
+            # The first page of a fresh backfill starts at the newest message, which is where
+            # catch-up has to resume; an empty channel catches up from the beginning
+            if batch or complete:
+                self.conn.execute(
+                    "INSERT OR IGNORE INTO sync_state (channel_id, synced_id) VALUES (?, ?)",
+                    (channel_id, batch[0].id if batch else 0)
+                )
+
+    def _synced_id(self, channel_id: int) -> Optional[int]:
+        row = self.conn.execute("SELECT synced_id FROM sync_state WHERE channel_id = ?", (channel_id,)).fetchone()
+        if row:
+            return row[0]
+        # Index written before sync_state existed
+        row = self.conn.execute("SELECT MAX(id) FROM messages WHERE channel_id = ?", (channel_id,)).fetchone()
+        return row[0]
+
+    async def _catch_up(self, channel) -> None:
+        synced_id = self._synced_id(channel.id)
+        if synced_id is None:
+            return
+        batch = []
+        async for message in channel.history(limit=None, after=discord.Object(id=synced_id), oldest_first=True):
+            batch.append(message)
+            if len(batch) >= BACKFILL_BATCH:
+                self._write_caught_up(batch, channel.id)
+                batch = []
+        self._write_caught_up(batch, channel.id)
+
+    def _write_caught_up(self, batch: List, channel_id: int) -> None:
+        if batch:
+            with self.conn:
+                self.conn.executemany(INSERT_MESSAGE, [_row(m) for m in batch])
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO sync_state (channel_id, synced_id) VALUES (?, ?)",
+                    (channel_id, batch[-1].id)
+                )
+
+    def _insert(self, batch: List) -> None:
+        if batch:
+            with self.conn:
+                self.conn.executemany(INSERT_MESSAGE, [_row(m) for m in batch])
+
+    # Queries
+
+    def search(
+        self,
+        channel_id: int,
+        query: str,
+        limit: int = 100,
+        author: Optional[str] = None,
+        after: Optional[str] = None,
+        before: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Newest-first messages in a channel matching every word of `query` (or containing
+        it, when it has no words), optionally filtered by author (name or id) and an
+        ISO-8601 date range.
+        """
+        conditions = ["m.channel_id = ?"]
+        params: List[Any] = [int(channel_id)]
+        fts_query = to_fts_query(query)
+        source = "messages m"
+        if fts_query:
+            source = "messages_fts JOIN messages m ON m.id = messages_fts.rowid"
+            conditions.append("messages_fts MATCH ?")
+            params.append(fts_query)
+        elif query.strip():
+            # Nothing to tokenize (e.g. "?"), so match the text itself as a substring
+            conditions.append("m.content LIKE ? ESCAPE '\\'")
+            params.append("%" + re.sub(r"([\\%_])", r"\\\1", query.strip()) + "%")
+        if author:
+            if author.isdigit():
+                conditions.append("m.author_id = ?")
+                params.append(int(author))
+            else:
+                conditions.append("m.author_name = ? COLLATE NOCASE")
+                params.append(author)
+        if after:
+            conditions.append("m.created_at > ?")
+            params.append(_timestamp(after))
+        if before:
+            conditions.append("m.created_at < ?")
+            params.append(_timestamp(before))
+        params.append(limit)
+
+        rows = self.conn.execute(
+            f"SELECT m.id, m.content, m.author_id, m.author_name, m.created_at FROM {source} "
+            f"WHERE {' AND '.join(conditions)} ORDER BY m.created_at DESC LIMIT ?",
+            params
+        )
+        return [
+            {
+                "id": str(message_id),
+                "content": content,
+                "author": author_name,
+                "author_id": str(author_id),
+                "timestamp": datetime.fromtimestamp(created_at, timezone.utc).isoformat()
+            }
+            for message_id, content, author_id, author_name, created_at in rows
+        ]
+
+    def close(self) -> None:
+        for task in self._syncing.values():
+            task.cancel()
+        self.conn.close()
\ No newline at end of file
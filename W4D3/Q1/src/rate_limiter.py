@@ -0,0 +1,300 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+import discord
+from .inspector.tracing import current_timing, bind_timing, unbind_timing
+
+logger = logging.getLogger(__name__)
+
+Route = Tuple[str, int]
+
+# (requests, per seconds) for each kind of route, per channel
+ROUTE_LIMITS = {
+    "send": (5, 5.0),
+    "delete": (5, 1.0)
+}
+
+# Discord's global limit across all routes
+GLOBAL_LIMIT = (50, 1.0)
+
+PRIORITIES = {"high": 0, "normal": 1, "low": 2}
+
+# Bulk delete takes 2-100 messages, none older than 14 days
+BULK_DELETE_MAX = 100
+BULK_DELETE_MAX_AGE = timedelta(days=14)
+
+MAX_RETRIES = 5
+
+class TokenBucket:
+    """Allows `capacity` requests per `per` seconds, refilling continuously."""
+
+    def __init__(self, capacity: int, per: float):
+        self.capacity = capacity
+        self.rate = capacity / per
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, now: float) -> float:
+        """Seconds until a request may go out on this bucket."""
+        self._refill(now)
+        if now < self.blocked_until:
+            return self.blocked_until - now
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def take(self, now: float) -> None:
+        self._refill(now)
+        self.tokens -= 1
+
+    def block(self, seconds: float) -> None:
+        """Stop this bucket for `seconds`, e.g. after a 429."""
+        self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+        self.tokens = 0.0
+
+class _Job:
+    __slots__ = ("priority", "seq", "route", "call", "future", "message_id", "retries", "timing", "queued_at")
+
+    def __init__(self, priority: int, seq: int, route: Route, call, future, message_id: Optional[int] = None):
+        self.priority = priority
+        self.seq = seq
+        self.route = route
+        self.call = call
+        self.future = future
+        # Set for deletes, which may be coalesced into one bulk delete
+        self.message_id = message_id
+        self.retries = 0
+        # Tool call this job is done for, so its queueing and HTTP time are attributed to it
+        self.timing = current_timing()
+        self.queued_at = time.monotonic()
+
+    def __lt__(self, other: "_Job") -> bool:
+        return (self.priority, self.seq) < (other.priority, other.seq)
+
+class RequestScheduler:
+    """
+    Queues Discord operations per route (kind of call and channel) and sends them
+    at the rate each route's bucket and the global bucket allow, most urgent first.
+    Queued deletes in one channel are coalesced into bulk deletes, and a 429 pauses
+    the affected bucket and puts the operation back in the queue.
+
+    A bulk delete silently skips ids that don't exist, so deletes are only coalesced
+    for messages `known_message(channel_id, message_id)` reports as existing in that
+    channel; without it none are coalesced,
+    and every delete reports its own result.
+    """
+
+    def __init__(self, known_message: Optional[Callable[[int, int], bool]] = None):
+        self.known_message = known_message
+        self._queues: Dict[Route, List[_Job]] = {}
+        self._buckets: Dict[Route, TokenBucket] = {}
+        self._global = TokenBucket(*GLOBAL_LIMIT)
+        self._channels: Dict[int, Any] = {}
+        self._seq = itertools.count()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._worker: Optional[asyncio.Task] = None
+        # Keep running sends referenced until they finish
+        self._tasks = set()
+        self.in_flight = 0
+        self.stats = {"completed": 0, "failed": 0, "retried_429": 0, "bulk_deletes": 0, "coalesced_deletes": 0}
+
+    # Submitting work
+
+    def _enqueue(self, job: _Job) -> None:
+        heapq.heappush(self._queues.setdefault(job.route, []), job)
+        self._wake()
+
+    def _wake(self) -> None:
+        """Signal the worker, starting it again if it exited while the queues were empty."""
+        if self._worker is None or self._worker.done():
+            self._wakeup = asyncio.Event()
+            self._worker = asyncio.create_task(self._run())
+        self._wakeup.set()
+
+    def submit(self, route: Route, call: Callable[[], Awaitable[Any]], priority: str = "normal") -> Awaitable[Any]:
+        """Queue `call` on `route`; the returned future resolves to its result."""
+        future = asyncio.get_running_loop().create_future()
+        self._enqueue(_Job(PRIORITIES.get(priority, 1), next(self._seq), route, call, future))
+        return future
+
+    def send_message(self, channel, content: str, priority: str = "normal") -> Awaitable[Any]:
+        return self.submit(("send", channel.id), lambda: channel.send(content), priority)
+
+    def delete_message(self, channel, message_id: int, priority: str = "normal") -> Awaitable[Any]:
+        """Queue a delete by id; deletes waiting together in a channel go out as one bulk delete."""
+        self._channels[channel.id] = channel
+        future = asyncio.get_running_loop().create_future()
+        partial = channel.get_partial_message(message_id)
+        self._enqueue(_Job(
+            PRIORITIES.get(priority, 1), next(self._seq), ("delete", channel.id),
+            partial.delete, future, message_id=message_id
+        ))
+        return future
+
+    # Dispatch
+
+    def _bucket(self, route: Route) -> TokenBucket:
+        if route not in self._buckets:
+            self._buckets[route] = TokenBucket(*ROUTE_LIMITS.get(route[0], (5, 1.0)))
+        return self._buckets[route]
+
+    def _next_ready(self, now: float) -> Tuple[Optional[Route], float]:
+        """The route whose head job is most urgent among those allowed to send, or how long to wait."""
+        global_wait = self._global.wait_time(now)
+        best, wait = None, float("inf")
+        for route, queue in self._queues.items():
+            if not queue:
+                continue
+            route_wait = max(global_wait, self._bucket(route).wait_time(now))
+            if route_wait == 0 and (best is None or queue[0] < self._queues[best][0]):
+                best = route
+            wait = min(wait, route_wait)
+        return best, wait
+
+    async def _run(self) -> None:
+        while True:
+            now = time.monotonic()
+            route, wait = self._next_ready(now)
+            if route is None:
+                self._wakeup.clear()
+                if wait == float("inf"):
+                    if not any(self._queues.values()):
+                        self._worker = None
+                        return
+                    wait = None
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=wait)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            self._global.take(now)
+            self._bucket(route).take(now)
+            jobs = self._pop_jobs(route)
+            task = asyncio.create_task(self._execute(route, jobs))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    def _pop_jobs(self, route: Route) -> List[_Job]:
+        queue = self._queues[route]
+        first = heapq.heappop(queue)
+        # DMs have no bulk delete
+        can_bulk = hasattr(self._channels.get(route[1]), "delete_messages")
+        if not can_bulk or not self._bulk_eligible(route[1], first.message_id):
+            return [first]
+        # Take every other bulk-eligible delete waiting in this channel along with it
+        jobs, rest = [first], []
+        while queue and len(jobs) < BULK_DELETE_MAX:
+            job = heapq.heappop(queue)
+            (jobs if self._bulk_eligible(route[1], job.message_id) else rest).append(job)
+        for job in rest:
+            heapq.heappush(queue, job)
+        return jobs
+
+    def _bulk_eligible(self, channel_id: int, message_id: Optional[int]) -> bool:
+        # An id from another channel would be skipped by this channel's bulk delete
+        if message_id is None or self.known_message is None or not self.known_message(channel_id, message_id):
+            return False
+        created = discord.utils.snowflake_time(message_id)
+        # A minute of margin so the message doesn't age out while queued
+        return datetime.now(timezone.utc) - created < BULK_DELETE_MAX_AGE - timedelta(minutes=1)
+
+    async def _execute(self, route: Route, jobs: List[_Job]) -> None:
+        self.in_flight += len(jobs)
+        now = time.monotonic()
+        for job in jobs:
+            if job.timing is not None:
+                job.timing.queue_seconds += now - job.queued_at
+        # A bulk delete's HTTP time is charged to the call that queued the first delete
+        token = bind_timing(jobs[0].timing)
+        try:
+            if len(jobs) > 1:
+                channel = self._channels[route[1]]
+                await channel.delete_messages([discord.Object(id=job.message_id) for job in jobs])
+                self.stats["bulk_deletes"] += 1
+                self.stats["coalesced_deletes"] += len(jobs)
+                results = [None] * len(jobs)
+            else:
+                results = [await jobs[0].call()]
+        except discord.RateLimited as e:
+            # discord.py gave up waiting out a long limit itself
+            self._retry_later(route, jobs, e, e.retry_after)
+            return
+        except discord.HTTPException as e:
+            if e.status == 429:
+                self._retry_later(route, jobs, e)
+                return
+            if len(jobs) > 1:
+                # One bad id fails the whole bulk delete; fall back to deleting one by one
+                for job in jobs:
+                    job.message_id = None
+                    self._requeue(route, job)
+                self._wake()
+                return
+            self._fail(jobs, e)
+            return
+        except Exception as e:
+            self._fail(jobs, e)
+            return
+        finally:
+            unbind_timing(token)
+            self.in_flight -= len(jobs)
+
+        for job, result in zip(jobs, results):
+            if not job.future.done():
+                job.future.set_result(result)
+        self.stats["completed"] += len(jobs)
+
+    def _retry_later(
+        self,
+        route: Route,
+        jobs: List[_Job],
+        error: Exception,
+        retry_after: Optional[float] = None
+    ) -> None:
+        headers = getattr(getattr(error, "response", None), "headers", None) or {}
+        if retry_after is None:
+            retry_after = float(headers.get("Retry-After", 1.0))
+        if headers.get("X-RateLimit-Global"):
+            self._global.block(retry_after)
+        else:
+            self._bucket(route).block(retry_after)
+        logger.warning(f"Rate limited on {route}, retrying in {retry_after:.2f}s")
+        for job in jobs:
+            job.retries += 1
+            if job.retries > MAX_RETRIES:
+                self._fail([job], error)
+            else:
+                self.stats["retried_429"] += 1
+                self._requeue(route, job)
+        self._wake()
+
+    def _requeue(self, route: Route, job: _Job) -> None:
+        # Restart the queue clock so the earlier wait isn't attributed twice
+        job.queued_at = time.monotonic()
+        heapq.heappush(self._queues[route], job)
+
+    def _fail(self, jobs: List[_Job], error: Exception) -> None:
+        for job in jobs:
+            if not job.future.done():
+                job.future.set_exception(error)
+        self.stats["failed"] += len(jobs)
+
+    # Introspection
+
+    def queue_stats(self) -> Dict[str, Any]:
+        """Queue depth per route, work in flight and running totals."""
+        depths = {f"{kind}:{channel_id}": len(queue) for (kind, channel_id), queue in self._queues.items() if queue}
+        return {
+            "queued": sum(depths.values()),
+            "in_flight": self.in_flight,
+            "routes": depths,
+            **self.stats
+        }
\ No newline at end of file
@@ -10,7 +10,7 @@ class ChannelTools:
     async def get_channel_info(self, channel_id: str) -> Dict[str, Any]:
         """Get information about a specific channel."""
         try:
-            channel = await self.bot.bot.fetch_channel(int(channel_id))
+            channel = await self.bot.channels.resolve(channel_id)
             return {
                 "success": True,
                 "channel_info": {
@@ -1,17 +1,63 @@
+import json
 import logging
-from typing import List, Dict, Any
+import os
+from datetime import datetime, timezone
+from typing import List, Dict, Any, Optional, AsyncIterator
+import discord
 
 logger = logging.getLogger(__name__)
 
+# Largest page get_messages returns; use the cursor or export_messages for more
+MAX_PAGE_SIZE = 500
+
+# Messages serialized and written at a time while exporting
+EXPORT_BATCH = 100
+
+def serialize_message(message) -> Dict[str, Any]:
+    """The fields tools return for a message, read straight off its attributes."""
+    author = message.author
+    return {
+        "id": str(message.id),
+        "content": message.content,
+        "author": author.name,
+        "author_id": str(author.id),
+        "timestamp": message.created_at.isoformat()
+    }
+
+async def iter_message_batches(
+    channel,
+    limit: Optional[int] = None,
+    batch_size: int = EXPORT_BATCH,
+    before: Optional[str] = None,
+    after: Optional[str] = None
+) -> AsyncIterator[List[Dict[str, Any]]]:
+    """
+    Yield serialized messages in batches as history pages arrive, newest first, or
+    oldest first when `after` is given. Only one batch is held at a time.
+    """
+    batch = []
+    async for message in channel.history(
+        limit=limit,
+        before=discord.Object(id=int(before)) if before else None,
+        after=discord.Object(id=int(after)) if after else None,
+        oldest_first=bool(after)
+    ):
+        batch.append(serialize_message(message))
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
 class MessageTools:
     def __init__(self, discord_bot):
         self.bot = discord_bot
 
-    async def send_message(self, channel_id: str, content: str) -> Dict[str, Any]:
-        """Send a message to a specific channel."""
+    async def send_message(self, channel_id: str, content: str, priority: str = "normal") -> Dict[str, Any]:
+        """Send a message to a specific channel, paced by the rate-limit scheduler."""
         try:
-            channel = await self.bot.bot.fetch_channel(int(channel_id))
-            message = await channel.send(content)
+            channel = await self.bot.channels.resolve(channel_id)
+            message = await self.bot.scheduler.send_message(channel, content, priority)
             return {
                 "success": True,
                 "message_id": str(message.id),
@@ -25,21 +71,41 @@ class MessageTools:
                 "error": str(e)
             }
 
-    async def get_messages(self, channel_id: str, limit: int = 100) -> Dict[str, Any]:
-        """Get recent messages from a channel."""
+    async def get_messages(
+        self,
+        channel_id: str,
+        limit: int = 100,
+        before: Optional[str] = None,
+        after: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Get one page of messages from a channel. Without cursors this is the newest
+        page; pass the returned `next_cursor` as `before` to page back through history,
+        or as `after` (which returns oldest first) to page forward. `limit` is capped at
+        MAX_PAGE_SIZE, and the response reports the limit actually applied.
+        """
         try:
-            channel = await self.bot.bot.fetch_channel(int(channel_id))
+            channel = await self.bot.channels.resolve(channel_id)
+            if limit <= 0:
+                # Nothing requested: stay where the cursor is
+                return {
+                    "success": True,
+                    "messages": [],
+                    "limit": 0,
+                    "limit_capped": False,
+                    "next_cursor": after or before
+                }
+            applied = min(limit, MAX_PAGE_SIZE)
             messages = []
-            async for message in channel.history(limit=limit):
-                messages.append({
-                    "id": str(message.id),
-                    "content": message.content,
-                    "author": str(message.author),
-                    "timestamp": message.created_at.isoformat()
-                })
+            async for batch in iter_message_batches(channel, applied, applied, before, after):
+                messages.extend(batch)
             return {
                 "success": True,
-                "messages": messages
+                "messages": messages,
+                "limit": applied,
+                "limit_capped": applied < limit,
+                # A short page means history is exhausted in this direction
+                "next_cursor": messages[-1]["id"] if len(messages) == applied else None
             }
         except Exception as e:
             logger.error(f"Failed to get messages: {e}")
@@ -48,26 +114,72 @@ class MessageTools:
                 "error": str(e)
             }
 
-    async def search_messages(self, channel_id: str, query: str, limit: int = 100) -> Dict[str, Any]:
-        """Search for messages containing specific text."""
+    async def export_messages(
+        self,
+        channel_id: str,
+        before: Optional[str] = None,
+        after: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Stream a channel's history (all of it by default) to a JSON-lines file in
+        MESSAGE_EXPORT_DIR, one batch at a time, so memory stays bounded however
+        long the channel is. An interrupted export can be resumed from `last_id`,
+        which failures report too.
+        """
+        path = None
+        count = 0
+        last_id = None
         try:
-            channel = await self.bot.bot.fetch_channel(int(channel_id))
-            messages = []
-            async for message in channel.history(limit=limit):
-                if query.lower() in message.content.lower():
-                    messages.append({
-                        "id": str(message.id),
-                        "content": message.content,
-                        "author": str(message.author),
-                        "timestamp": message.created_at.isoformat()
-                    })
+            channel = await self.bot.channels.resolve(channel_id)
+            export_dir = os.getenv("MESSAGE_EXPORT_DIR", "exports")
+            os.makedirs(export_dir, exist_ok=True)
+            stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
+            path = os.path.join(export_dir, f"{channel.id}-{stamp}.jsonl")
+            with open(path, "w", encoding="utf-8") as f:
+                async for batch in iter_message_batches(channel, limit, EXPORT_BATCH, before, after):
+                    f.writelines(json.dumps(message) + "\n" for message in batch)
+                    count += len(batch)
+                    last_id = batch[-1]["id"]
+            return {
+                "success": True,
+                "path": path,
+                "count": count,
+                "last_id": last_id
+            }
+        except Exception as e:
+            logger.error(f"Failed to export messages: {e}")
+            return {
+                "success": False,
+                "error": str(e),
+                "path": path,
+                "count": count,
+                "last_id": last_id
+            }
+
+    async def search_messages(
+        self,
+        channel_id: str,
+        query: str,
+        limit: int = 100,
+        author: Optional[str] = None,
+        after: Optional[str] = None,
+        before: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Search a channel's whole history through the local message index."""
+        try:
+            channel = await self.bot.channels.resolve(channel_id)
+            # Backfill (once) and offline catch-up run in the background; answer from what's indexed
+            complete = self.bot.message_index.start_sync(channel)
+            messages = self.bot.message_index.search(channel.id, query, limit, author, after, before)
             return {
                 "success": True,
-                "messages": messages
+                "messages": messages,
+                "index_complete": complete
             }
         except Exception as e:
             logger.error(f"Failed to search messages: {e}")
             return {
                 "success": False,
                 "error": str(e)
-            } 
\ No newline at end of file
+            }
\ No newline at end of file
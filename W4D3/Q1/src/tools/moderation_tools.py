@@ -7,14 +7,20 @@ class ModerationTools:
     def __init__(self, discord_bot):
         self.bot = discord_bot
 
-    async def moderate_content(self, channel_id: str, message_id: str, action: str) -> Dict[str, Any]:
+    async def moderate_content(
+        self,
+        channel_id: str,
+        message_id: str,
+        action: str,
+        priority: str = "normal"
+    ) -> Dict[str, Any]:
         """Moderate content in a channel (delete messages)."""
         try:
-            channel = await self.bot.bot.fetch_channel(int(channel_id))
-            message = await channel.fetch_message(int(message_id))
+            channel = await self.bot.channels.resolve(channel_id)
             
             if action.lower() == "delete":
-                await message.delete()
+                # Deletes by id without fetching first; queued deletes are sent as bulk deletes
+                await self.bot.scheduler.delete_message(channel, int(message_id), priority)
                 return {
                     "success": True,
                     "action": "delete",
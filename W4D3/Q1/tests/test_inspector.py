@@ -0,0 +1,77 @@
+import asyncio
+import json
+from src.inspector.debug import MCPInspector, MAX_TOOL_HISTOGRAMS, OTHER_TOOLS
+from src.inspector.tracing import current_timing, trace_tool
+
+def test_ring_buffer_keeps_latest_requests():
+    inspector = MCPInspector(capacity=5, sample_rate=0)
+    for i in range(12):
+        inspector.log_request({"tool": "send_message", "duration_ms": i, "params": {"content": "x" * i}})
+
+    recent = inspector.get_recent_requests(limit=10)
+    assert len(inspector.requests) == 5
+    assert [r["duration_ms"] for r in recent] == [7, 8, 9, 10, 11]
+    assert recent[-1]["payload_size"] == len(json.dumps({"content": "x" * 11}))
+
+def test_recent_requests_filters():
+    inspector = MCPInspector(capacity=100, sample_rate=0)
+    inspector.record("get_messages", 5.0)
+    inspector.record("send_message", 300.0, status="error")
+    inspector.record("send_message", 40.0)
+
+    assert [r["duration_ms"] for r in inspector.get_recent_requests(tool="send_message")] == [300.0, 40.0]
+    assert [r["tool"] for r in inspector.get_recent_requests(status="error")] == ["send_message"]
+    assert [r["duration_ms"] for r in inspector.get_recent_requests(min_duration_ms=10)] == [300.0, 40.0]
+    assert inspector.get_recent_requests(limit=0) == []
+
+def test_latency_histograms():
+    inspector = MCPInspector(capacity=10, sample_rate=0)
+    for _ in range(98):
+        inspector.record("get_messages", 3.0)
+    inspector.record("get_messages", 150.0)
+    inspector.record("get_messages", 40000.0, status="error")
+
+    stats = inspector.get_latency_stats("get_messages")["get_messages"]
+    assert stats["count"] == 100
+    assert stats["errors"] == 1
+    assert stats["p50_ms"] == 5.0
+    assert stats["p99_ms"] == 200.0
+    assert stats["max_ms"] == 40000.0
+
+def test_histogram_count_is_capped():
+    inspector = MCPInspector(capacity=10, sample_rate=0)
+    for i in range(MAX_TOOL_HISTOGRAMS + 50):
+        inspector.log_request({"tool": f"tool-{i}", "duration_ms": 1.0})
+
+    assert len(inspector.histograms) == MAX_TOOL_HISTOGRAMS + 1
+    assert inspector.get_latency_stats(OTHER_TOOLS)[OTHER_TOOLS]["count"] == 50
+
+def test_sampled_spill(tmp_path):
+    path = tmp_path / "requests.jsonl"
+    inspector = MCPInspector(capacity=2, spill_path=str(path), sample_rate=1.0)
+    for i in range(4):
+        inspector.record("search_messages", float(i))
+    inspector.close()
+
+    lines = path.read_text().splitlines()
+    assert len(lines) == 4
+    assert json.loads(lines[-1])["tool"] == "search_messages"
+
+def test_trace_tool_splits_discord_time():
+    inspector = MCPInspector(capacity=10, sample_rate=0)
+
+    async def tool(channel_id: str):
+        current_timing().api_seconds += 0.5
+        return {"success": False, "error": "missing"}
+
+    traced = trace_tool(inspector, "get_channel_info", tool)
+    assert asyncio.run(traced(channel_id="1")) == {"success": False, "error": "missing"}
+    assert current_timing() is None
+
+    record = inspector.get_recent_requests()[0]
+    assert record["status"] == "error"
+    assert record["discord_ms"] == 500.0
+    assert record["payload_size"] == len(json.dumps({"channel_id": "1"}))
+    stats = inspector.get_latency_stats()["get_channel_info"]
+    assert stats["discord"]["p50_ms"] == 500.0
+    assert stats["local"]["p50_ms"] == 1.0
\ No newline at end of file
@@ -0,0 +1,96 @@
+import asyncio
+from datetime import datetime, timezone
+from types import SimpleNamespace
+import pytest
+
+pytest.importorskip("discord")
+from src.message_index import MessageIndex
+
+CHANNEL_ID = 42
+
+def make_message(message_id, content=None):
+    return SimpleNamespace(
+        id=message_id,
+        channel=SimpleNamespace(id=CHANNEL_ID),
+        author=SimpleNamespace(id=7, name="alice"),
+        content=content or f"message {message_id}",
+        created_at=datetime.fromtimestamp(1_700_000_000 + message_id, timezone.utc)
+    )
+
+class FakeChannel:
+    """Channel whose history is a list of messages, optionally held until `release` is set."""
+
+    def __init__(self, messages, release=None):
+        self.id = CHANNEL_ID
+        self.messages = messages
+        self.release = release
+
+    def history(self, limit=None, before=None, after=None, oldest_first=False):
+        async def pages():
+            if self.release is not None:
+                await self.release.wait()
+            selected = [
+                m for m in self.messages
+                if (before is None or m.id < before.id) and (after is None or m.id > after.id)
+            ]
+            for message in sorted(selected, key=lambda m: m.id, reverse=not oldest_first):
+                yield message
+        return pages()
+
+def indexed_ids(index):
+    return [row[0] for row in index.conn.execute("SELECT id FROM messages ORDER BY id")]
+
+def test_catch_up_fills_offline_gap_despite_live_inserts(tmp_path):
+    db_path = str(tmp_path / "messages.db")
+
+    async def scenario():
+        index = MessageIndex(db_path)
+        await index.ensure_synced(FakeChannel([make_message(i) for i in range(1, 6)]))
+        index.close()
+
+        # Restart: 6-8 were sent while offline, and 9 arrives live before the first search
+        restarted = MessageIndex(db_path)
+        restarted.add_message(make_message(9))
+        await restarted.ensure_synced(FakeChannel([make_message(i) for i in range(1, 10)]))
+        return restarted
+
+    index = asyncio.run(scenario())
+    assert indexed_ids(index) == list(range(1, 10))
+
+def test_search_does_not_wait_for_backfill(tmp_path):
+    async def scenario():
+        index = MessageIndex(str(tmp_path / "messages.db"))
+        release = asyncio.Event()
+        channel = FakeChannel([make_message(i, "hello history") for i in range(1, 4)], release)
+        index.add_message(make_message(10, "hello live"))
+
+        assert index.start_sync(channel) is False
+        partial = [m["id"] for m in index.search(CHANNEL_ID, "hello")]
+
+        release.set()
+        await index.ensure_synced(channel)
+        assert index.start_sync(channel) is True
+        return partial, [m["id"] for m in index.search(CHANNEL_ID, "hello")]
+
+    partial, complete = asyncio.run(scenario())
+    assert partial == ["10"]
+    assert complete == ["10", "3", "2", "1"]
+
+def test_reinserted_message_drops_old_terms(tmp_path):
+    index = MessageIndex(str(tmp_path / "messages.db"))
+    index.add_message(make_message(10, "hello world"))
+    # e.g. catch-up re-reading a message that was edited while the bot was offline
+    index.add_message(make_message(10, "goodbye moon"))
+
+    assert index.search(CHANNEL_ID, "hello") == []
+    assert [m["content"] for m in index.search(CHANNEL_ID, "goodbye")] == ["goodbye moon"]
+
+def test_query_without_words_matches_as_substring(tmp_path):
+    index = MessageIndex(str(tmp_path / "messages.db"))
+    index.add_message(make_message(1, "any questions?"))
+    index.add_message(make_message(2, "no questions"))
+    index.add_message(make_message(3, "100% sure_thing"))
+
+    assert [m["id"] for m in index.search(CHANNEL_ID, "?")] == ["1"]
+    assert [m["id"] for m in index.search(CHANNEL_ID, "!!")] == []
+    assert [m["id"] for m in index.search(CHANNEL_ID, "%")] == ["3"]
\ No newline at end of file
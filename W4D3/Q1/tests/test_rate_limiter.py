@@ -0,0 +1,114 @@
+import asyncio
+from datetime import datetime, timezone
+from types import SimpleNamespace
+import pytest
+
+discord = pytest.importorskip("discord")
+from src.message_index import MessageIndex
+from src.rate_limiter import RequestScheduler
+
+def http_error(status, retry_after=None):
+    headers = {"Retry-After": str(retry_after)} if retry_after is not None else {}
+    response = SimpleNamespace(status=status, reason="error", headers=headers)
+    return discord.HTTPException(response, "error")
+
+def recent_id(offset=0):
+    return discord.utils.time_snowflake(datetime.now(timezone.utc)) + offset
+
+class FakeChannel:
+    """Records sends and deletes; each entry of `failures` is raised by one call, in order."""
+
+    def __init__(self, failures=(), bulk_failures=(), missing=()):
+        self.id = 1
+        self.failures = list(failures)
+        self.bulk_failures = list(bulk_failures)
+        self.missing = set(missing)
+        self.sent = []
+        self.deleted = []
+        self.bulk_deleted = []
+
+    async def send(self, content):
+        if self.failures:
+            raise self.failures.pop(0)
+        self.sent.append(content)
+        return content
+
+    def get_partial_message(self, message_id):
+        async def delete():
+            if message_id in self.missing:
+                raise http_error(404)
+            self.deleted.append(message_id)
+        return SimpleNamespace(delete=delete)
+
+    async def delete_messages(self, messages):
+        if self.bulk_failures:
+            raise self.bulk_failures.pop(0)
+        self.bulk_deleted.append([m.id for m in messages])
+
+def test_send_is_retried_after_429():
+    async def scenario():
+        scheduler = RequestScheduler()
+        channel = FakeChannel(failures=[http_error(429, retry_after=0.01)])
+        result = await asyncio.wait_for(scheduler.send_message(channel, "hello"), timeout=2)
+        return scheduler, channel, result
+
+    scheduler, channel, result = asyncio.run(scenario())
+    assert result == "hello"
+    assert channel.sent == ["hello"]
+    assert scheduler.stats["retried_429"] == 1
+    assert scheduler.queue_stats()["queued"] == 0
+
+def test_known_deletes_are_coalesced():
+    ids = [recent_id(i) for i in range(3)]
+    unknown = recent_id(10)
+
+    async def scenario():
+        scheduler = RequestScheduler(known_message=lambda channel_id, message_id: message_id in ids)
+        channel = FakeChannel()
+        futures = [scheduler.delete_message(channel, message_id) for message_id in ids + [unknown]]
+        await asyncio.wait_for(asyncio.gather(*futures), timeout=2)
+        return scheduler, channel
+
+    scheduler, channel = asyncio.run(scenario())
+    assert channel.bulk_deleted == [ids]
+    # Not known to exist, so it is deleted on its own and could report a 404
+    assert channel.deleted == [unknown]
+    assert scheduler.stats["coalesced_deletes"] == 3
+
+def test_failed_bulk_delete_falls_back_to_single_deletes():
+    ids = [recent_id(i) for i in range(3)]
+
+    async def scenario():
+        scheduler = RequestScheduler(known_message=lambda channel_id, message_id: True)
+        channel = FakeChannel(bulk_failures=[http_error(400)], missing={ids[1]})
+        futures = [scheduler.delete_message(channel, message_id) for message_id in ids]
+        results = await asyncio.wait_for(asyncio.gather(*futures, return_exceptions=True), timeout=2)
+        return channel, results
+
+    channel, results = asyncio.run(scenario())
+    assert channel.bulk_deleted == []
+    assert sorted(channel.deleted) == [ids[0], ids[2]]
+    assert results[0] is None and results[2] is None
+    assert isinstance(results[1], discord.HTTPException) and results[1].status == 404
+
+def test_delete_known_only_in_other_channel_is_not_coalesced(tmp_path):
+    ids = [recent_id(i) for i in range(3)]
+    elsewhere = recent_id(10)
+    index = MessageIndex(str(tmp_path / "messages.db"))
+    for message_id, channel_id in [(ids[0], 1), (ids[1], 1), (ids[2], 1), (elsewhere, 2)]:
+        index.add_message(SimpleNamespace(
+            id=message_id, channel=SimpleNamespace(id=channel_id),
+            author=SimpleNamespace(id=7, name="alice"), content="spam",
+            created_at=datetime.now(timezone.utc)
+        ))
+
+    async def scenario():
+        scheduler = RequestScheduler(known_message=index.has_message)
+        channel = FakeChannel()
+        futures = [scheduler.delete_message(channel, message_id) for message_id in ids + [elsewhere]]
+        await asyncio.wait_for(asyncio.gather(*futures), timeout=2)
+        return channel
+
+    channel = asyncio.run(scenario())
+    assert channel.bulk_deleted == [ids]
+    assert channel.deleted == [elsewhere]
\ No newline at end of file